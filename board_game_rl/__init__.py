@@ -1,6 +1,37 @@
 # Inside board_game_rl/__init__.py
-from .board_classes import GameBoard, Player, Agent
-from .env_class import GameEnv
-from .board_playing import play_simulated_random_game
-from .example_logic.tictactoe_logic import tictactoe_logic
-from .example_policies.random_policy import random_policy
+import importlib
+from .board_classes import GameBoard, Player, Agent, BatchAgent
+from .registry import register_game, register_policy, get_game, get_policy
+
+# Everything else is imported on first access (PEP 562), so that `import board_game_rl` in a
+# worker process only loads what the worker uses.
+_lazy_attributes = {
+    "GameEnv" : ".env_class",
+    "VectorGameEnv" : ".vector_env_class",
+    "play_simulated_random_game" : ".board_playing",
+    "play_game" : ".board_playing",
+    "play_batched_games" : ".board_playing",
+    "run_tournament" : ".tournament",
+    "tictactoe_logic" : ".example_logic.tictactoe_logic",
+    "tictactoe_bitboard_logic" : ".example_logic.tictactoe_bitboard_logic",
+    "mnk_logic" : ".example_logic.mnk_logic",
+    "gomoku_logic" : ".example_logic.mnk_logic",
+    "connect_four_logic" : ".example_logic.connect_four_logic",
+    "random_policy" : ".example_policies.random_policy",
+    "perfect_policy" : ".example_policies.perfect_policy",
+}
+
+__all__ = [
+    "GameBoard", "Player", "Agent", "BatchAgent",
+    "register_game", "register_policy", "get_game", "get_policy",
+] + list(_lazy_attributes)
+
+def __getattr__(name):
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_lazy_attributes[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
@@ -0,0 +1,343 @@
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from .board_classes import GameBoard, Player
+from .env_class import GameEnv
+from .registry import get_game
+from .tournament import seed_worker
+from .trajectory import trajectory_columns
+
+# The columns of the control block, one row per worker. Each counter has a single writer: the worker
+# writes WRITTEN and STALLS, the learner CONSUMED, and the supervisor STOP. Rows are padded to 64
+# bytes so workers do not share cache lines.
+WRITTEN, CONSUMED, STALLS, STOP = range(4)
+CONTROL_WIDTH = 8
+
+class _Stopped(Exception):
+    pass
+
+class SharedRing:
+    """
+    A ring of transition slots in shared memory, partitioned between workers. Each column of
+    trajectory_columns(board_shape) is one shared array of shape (num_workers, slots_per_worker,
+    slot_size, ...); worker w only ever writes the slots of row w.
+
+    Slots are handed over with two sequence counters per worker instead of locks: the worker
+    publishes a full slot by incrementing written[w], and the learner frees it by incrementing
+    consumed[w]. Slot k of worker w is ready when consumed[w] <= k < written[w], and the worker may
+    only write while written[w] - consumed[w] < slots_per_worker, which is the back-pressure on
+    workers when the learner falls behind.
+
+    Args:
+    board_shape: tuple[int, int]
+    num_workers: int
+    slots_per_worker: int
+    slot_size: int, the number of transitions in one slot
+    spec: dict or None, attach to the ring described by SharedRing.spec instead of creating one
+    """
+    def __init__(self, board_shape, num_workers, slots_per_worker=8, slot_size=1024, spec=None):
+        self.board_shape = tuple(board_shape)
+        self.num_workers = num_workers
+        self.slots_per_worker = slots_per_worker
+        self.slot_size = slot_size
+        self.owner = spec is None
+        layout = {
+            name: (dtype, (num_workers, slots_per_worker, slot_size) + shape)
+            for name, (dtype, shape) in trajectory_columns(self.board_shape).items()
+        }
+        layout["control"] = (np.int64, (num_workers, CONTROL_WIDTH))
+        layout["lengths"] = (np.int64, (num_workers, slots_per_worker))
+
+        self._memory = {}
+        self.arrays = {}
+        for name, (dtype, shape) in layout.items():
+            if self.owner:
+                size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+                memory = shared_memory.SharedMemory(create=True, size=size)
+            else:
+                memory = shared_memory.SharedMemory(name=spec["names"][name])
+            self._memory[name] = memory
+            self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+        if self.owner:
+            self.arrays["control"][:] = 0
+        self.control = self.arrays["control"]
+        self.lengths = self.arrays["lengths"]
+        self.columns = {name: self.arrays[name] for name in trajectory_columns(self.board_shape)}
+
+    @property
+    def spec(self) -> dict:
+        """
+        A picklable description of the ring, for SharedRing.attach in another process.
+        """
+        return {
+            "board_shape" : self.board_shape,
+            "num_workers" : self.num_workers,
+            "slots_per_worker" : self.slots_per_worker,
+            "slot_size" : self.slot_size,
+            "names" : {name: memory.name for name, memory in self._memory.items()},
+        }
+
+    @classmethod
+    def attach(cls, spec: dict):
+        return cls(spec["board_shape"], spec["num_workers"], spec["slots_per_worker"], spec["slot_size"], spec=spec)
+
+    def close(self) -> None:
+        """
+        Drop this process's mapping of the ring; the owner also frees the shared memory.
+        """
+        self.arrays, self.columns = {}, {}
+        self.control = self.lengths = None
+        for memory in self._memory.values():
+            memory.close()
+            if self.owner:
+                memory.unlink()
+        self._memory = {}
+
+    ########################### Learner Side ###########################
+
+    def ready(self, worker: int) -> int:
+        """
+        The number of published slots of worker that the learner has not released yet.
+        """
+        return int(self.control[worker, WRITTEN] - self.control[worker, CONSUMED])
+
+    def view(self, worker: int) -> dict:
+        """
+        Zero-copy views of the oldest unreleased slot of worker (which must be ready). The views
+        stay valid until the slot is released.
+
+        Returns:
+        dict[str, np.ndarray]: One array per trajectory column.
+        """
+        slot = int(self.control[worker, CONSUMED]) % self.slots_per_worker
+        length = int(self.lengths[worker, slot])
+        return {name: column[worker, slot, :length] for name, column in self.columns.items()}
+
+    def release(self, worker: int) -> None:
+        """
+        Give the oldest unreleased slot of worker back to the worker.
+        """
+        self.control[worker, CONSUMED] += 1
+
+class RingWriter:
+    """
+    The worker side of a SharedRing, with the interface of TrajectoryRecorder so it can be passed
+    to GameEnv(game_logic, recorder=writer). Transitions are written straight into the current slot
+    of the worker, and the slot is published when it is full.
+
+    Args:
+    ring: SharedRing
+    worker: int
+    wait: float, seconds between checks while every slot of the worker is waiting for the learner
+    """
+    def __init__(self, ring: SharedRing, worker: int, wait=0.0005):
+        self.ring = ring
+        self.worker = worker
+        self.wait = wait
+        self.columns = {name: column[worker] for name, column in ring.columns.items()}
+        self.slot = None
+        self.row = 0
+
+    def _acquire(self) -> None:
+        # Back-pressure: wait until the learner has released a slot of this worker.
+        control = self.ring.control[self.worker]
+        while control[WRITTEN] - control[CONSUMED] >= self.ring.slots_per_worker:
+            if control[STOP]:
+                raise _Stopped()
+            control[STALLS] += 1
+            time.sleep(self.wait)
+        self.slot = int(control[WRITTEN]) % self.ring.slots_per_worker
+        self.row = 0
+
+    def _publish(self) -> None:
+        # The rows are written before the counter, so the learner never sees a partly written slot.
+        self.ring.lengths[self.worker, self.slot] = self.row
+        self.ring.control[self.worker, WRITTEN] += 1
+        self.slot = None
+
+    def record(self, state, action, player, reward, done, next_state) -> None:
+        if self.ring.control[self.worker, STOP]:
+            raise _Stopped()
+        if self.slot is None:
+            self._acquire()
+        columns, slot, row = self.columns, self.slot, self.row
+        columns["states"][slot, row] = state
+        columns["next_states"][slot, row] = next_state
+        columns["actions"][slot, row] = action
+        columns["players"][slot, row] = player.value
+        columns["rewards"][slot, row] = reward
+        columns["dones"][slot, row] = done
+        self.row += 1
+        if self.row == self.ring.slot_size:
+            self._publish()
+
+def actor_worker(spec: dict, worker: int, logic, agent_factory, seed_sequence) -> None:
+    """
+    The loop of one actor process: play self-play games with GameEnv and write every transition
+    into the worker's slots of the shared ring until the supervisor sets the stop flag.
+
+    Args:
+    spec: dict, SharedRing.spec
+    worker: int
+    logic: dict[str, callable] or str, the logic or the name of a registered game
+    agent_factory: callable, called as agent_factory(Player.A) and agent_factory(Player.B)
+    seed_sequence: np.random.SeedSequence
+    """
+    seed_worker(seed_sequence)
+    ring = SharedRing.attach(spec)
+    env = GameEnv(get_game(logic) if isinstance(logic, str) else logic, recorder=RingWriter(ring, worker))
+    agents = (agent_factory(Player.A), agent_factory(Player.B))
+    try:
+        while True:
+            env.reset()
+            turn = 0
+            while not env.done:
+                agent = agents[turn]
+                env.step(agent.player, agent(env.game_board))
+                turn = 1 - turn
+    except _Stopped:
+        pass
+    finally:
+        env.recorder = None
+        ring.close()
+
+class ActorLearner:
+    """
+    A pool of actor processes feeding a learner through a SharedRing. Actors write transitions
+    straight into shared memory, so nothing is pickled per transition; the learner iterates over
+    batches() and gets each full slot as zero-copy NumPy views.
+
+    poll() (called by batches()) restarts workers that died, up to max_restarts in total. A restarted
+    worker continues from its sequence counters, so a slot it was writing when it died is simply
+    rewritten, and it gets a fresh seed. When the learner falls behind, workers wait for free slots
+    (counted in stalls) instead of overwriting unread data.
+
+    Args:
+    logic: dict[str, callable] or str
+    agent_factory: callable, called as agent_factory(Player.A) and agent_factory(Player.B); must be
+        picklable
+    num_workers: int
+    slots_per_worker: int
+    slot_size: int
+    seed: int or None
+    max_restarts: int
+    mp_context: multiprocessing context or None
+
+    Example:
+    ```python
+    >>> from board_game_rl import Agent, random_policy
+    >>> from board_game_rl.actor_learner import ActorLearner
+    >>> def random_agent(player):
+    ...     return Agent(player, random_policy)
+    >>> with ActorLearner("tictactoe", random_agent, num_workers=4) as pipeline:
+    ...     for batch in pipeline.batches(100):
+    ...         learn(batch["states"], batch["actions"], batch["rewards"])
+    ```
+    """
+    def __init__(self, logic, agent_factory, num_workers, slots_per_worker=8, slot_size=1024, seed=None,
+                 max_restarts=10, mp_context=None):
+        self.logic = logic
+        self.agent_factory = agent_factory
+        self.num_workers = num_workers
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.context = mp_context or multiprocessing.get_context()
+        board_shape = GameBoard(get_game(logic) if isinstance(logic, str) else logic).board_shape
+        self.ring = SharedRing(board_shape, num_workers, slots_per_worker, slot_size)
+        self._seeds = np.random.SeedSequence(seed)
+        self._next_worker = 0
+        self.processes = [None]*num_workers
+
+    def _spawn(self, worker: int) -> None:
+        process = self.context.Process(
+            target=actor_worker,
+            args=(self.ring.spec, worker, self.logic, self.agent_factory, self._seeds.spawn(1)[0]),
+            daemon=True,
+        )
+        process.start()
+        self.processes[worker] = process
+
+    def start(self) -> None:
+        for worker in range(self.num_workers):
+            self._spawn(worker)
+
+    def poll(self) -> None:
+        """
+        Restart workers that exited without being asked to stop.
+        """
+        for worker, process in enumerate(self.processes):
+            if process is not None and not process.is_alive() and not self.ring.control[worker, STOP]:
+                if self.restarts >= self.max_restarts:
+                    raise RuntimeError(f"Actor {worker} exited with code {process.exitcode} and no restarts are left.")
+                self.restarts += 1
+                self._spawn(worker)
+
+    @property
+    def stalls(self) -> int:
+        """
+        The number of times workers had to wait for the learner.
+        """
+        return int(self.ring.control[:, STALLS].sum())
+
+    def next_batch(self, timeout=None):
+        """
+        Wait for the next full slot, taking workers in turn.
+
+        Args:
+        timeout: float or None, seconds
+
+        Returns:
+        tuple[int, dict]: The worker and zero-copy views of its slot, or None on timeout. The slot
+        must be given back with self.ring.release(worker) once the views are no longer needed.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            for offset in range(self.num_workers):
+                worker = (self._next_worker + offset) % self.num_workers
+                if self.ring.ready(worker):
+                    self._next_worker = (worker + 1) % self.num_workers
+                    return worker, self.ring.view(worker)
+            if deadline is not None and time.perf_counter() > deadline:
+                return None
+            self.poll()
+            time.sleep(0.0005)
+
+    def batches(self, num_batches=None):
+        """
+        Yield full slots as dicts of zero-copy views. Each slot is released when the next one is
+        requested, so copy anything that must outlive the iteration step.
+
+        Args:
+        num_batches: int or None, stop after this many batches (None for no limit)
+        """
+        count = 0
+        while num_batches is None or count < num_batches:
+            worker, views = self.next_batch()
+            try:
+                yield views
+            finally:
+                self.ring.release(worker)
+            count += 1
+
+    def stop(self, timeout=5.0) -> None:
+        """
+        Stop the workers and free the shared memory.
+        """
+        if self.ring.control is None:
+            return
+        self.ring.control[:, STOP] = 1
+        for process in self.processes:
+            if process is not None:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+        self.ring.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
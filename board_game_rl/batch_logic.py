@@ -0,0 +1,79 @@
+import numpy as np
+from .board_classes import Player
+
+# Fallbacks for the batched logic hooks "batch_winner", "batch_legal_mask" and "batch_play". The
+# batches are ndarrays of shape (N, rows, cols); logic without a hook is called once per board,
+# with each board converted to the format of the logic by its "from_array" hook if it has one.
+
+def as_logic_board(logic, board):
+    """
+    A board of a batch in the format the per-board logic functions take.
+
+    Args:
+    logic: dict[str, callable]
+    board: np.ndarray
+
+    Returns:
+    A board in the format of the logic
+    """
+    if "from_array" in logic:
+        return logic["from_array"](board)
+    return board
+
+def batch_winner(logic, boards) -> np.ndarray:
+    """
+    The winners of a batch of boards, as player values.
+
+    Args:
+    logic: dict[str, callable]
+    boards: np.ndarray of shape (N, rows, cols)
+
+    Returns:
+    np.ndarray of shape (N,)
+    """
+    if "batch_winner" in logic:
+        return logic["batch_winner"](boards)
+    return np.array([logic["winner"](as_logic_board(logic, board)).value for board in boards], dtype=float)
+
+def batch_legal_mask(logic, boards, num_actions: int, move_to_action: callable) -> np.ndarray:
+    """
+    The legal-action masks of a batch of boards.
+
+    Args:
+    logic: dict[str, callable]
+    boards: np.ndarray of shape (N, rows, cols)
+    num_actions: int
+    move_to_action: callable, maps a move of the logic to its action
+
+    Returns:
+    np.ndarray of shape (N, num_actions) and dtype bool
+    """
+    if "batch_legal_mask" in logic:
+        return logic["batch_legal_mask"](boards)
+    masks = np.zeros((len(boards), num_actions), dtype=bool)
+    for i, board in enumerate(boards):
+        for move in logic["valid_moves"](as_logic_board(logic, board)):
+            masks[i, move_to_action(move)] = True
+    return masks
+
+def batch_play(logic, boards, players, actions, action_to_move: callable) -> np.ndarray:
+    """
+    Play one action on each board of a batch, in place.
+
+    Args:
+    logic: dict[str, callable]
+    boards: np.ndarray of shape (N, rows, cols)
+    players: np.ndarray of shape (N,), player values
+    actions: np.ndarray of shape (N,)
+    action_to_move: callable, maps an action to a move of the logic
+
+    Returns:
+    np.ndarray: boards
+    """
+    if "batch_play" in logic:
+        return logic["batch_play"](boards, players, actions)
+    for i, (player, action) in enumerate(zip(players, actions)):
+        board = as_logic_board(logic, boards[i])
+        played = logic["play"](board, Player(player), action_to_move(action), mutate=False)
+        boards[i] = np.asarray(played)
+    return boards
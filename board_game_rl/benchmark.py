@@ -0,0 +1,242 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import numpy as np
+from .board_classes import Agent, GameBoard, Player
+from .env_class import GameEnv
+from .board_playing import play_game, play_simulated_random_game, play_against_random_agent, play_two_player_game
+from .example_policies.random_policy import random_policy
+from .registry import available_games, get_game
+from .trajectory import trajectory_columns
+
+# Metrics whose name ends with one of these suffixes get better when they grow; all others
+# (latencies, bytes) get better when they shrink.
+HIGHER_IS_BETTER = ("_per_sec",)
+
+def _best_time(function, repeat=3) -> float:
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def sample_positions(logic, num_games=50, seed=0) -> list[tuple]:
+    """
+    Collect (board, player to move, last move, player of last move) samples from random games.
+    """
+    random.seed(seed)
+    board = GameBoard(logic)
+    samples = []
+    for _ in range(num_games):
+        board.reset()
+        player, last = Player.A, (None, None)
+        while not board.game_over():
+            samples.append((board.board.copy(), player) + last)
+            move = random_policy(board, player)
+            board.play(player, move)
+            last = (move, player)
+            player = Player.B if player == Player.A else Player.A
+        samples.append((board.board.copy(), player) + last)
+    return samples
+
+def benchmark_play_loops(logic, num_games) -> dict:
+    """
+    Games per second and steps per second of the game loops in board_playing and of GameEnv.step.
+    The printing loops run with stdout redirected.
+    """
+    board = GameBoard(logic)
+    agentA = Agent(Player.A, random_policy)
+    agentB = Agent(Player.B, random_policy)
+
+    # Measure the mean game length with the silent loop.
+    lengths = [play_game(board, agentA, agentB)[1] for _ in range(num_games)]
+    mean_length = float(np.mean(lengths))
+
+    loops = {
+        "play_game" : lambda: play_game(board, agentA, agentB),
+        "play_simulated_random_game" : lambda: play_simulated_random_game(board),
+        "play_against_random_agent" : lambda: play_against_random_agent(board, agentA),
+        "play_two_player_game" : lambda: play_two_player_game(board, agentA, agentB),
+    }
+    results = {"mean_game_length" : mean_length}
+    for name, loop in loops.items():
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(num_games):
+                    loop()
+        games_per_sec = num_games / _best_time(run)
+        results[f"{name}.games_per_sec"] = games_per_sec
+        results[f"{name}.steps_per_sec"] = games_per_sec*mean_length
+
+    # GameEnv.step with random actions, as a learner would drive it.
+    env = GameEnv(logic)
+    def run_env():
+        steps = 0
+        for _ in range(num_games):
+            env.reset()
+            player = Player.A
+            while not env.done:
+                env.step(player, random_policy(env.game_board, player))
+                player = Player.B if player == Player.A else Player.A
+                steps += 1
+        return steps
+    start = time.perf_counter()
+    steps = run_env()
+    elapsed = time.perf_counter() - start
+    results["GameEnv.step.games_per_sec"] = num_games / elapsed
+    results["GameEnv.step.steps_per_sec"] = steps / elapsed
+    return results
+
+def benchmark_logic_calls(logic, samples, repeat=3) -> dict:
+    """
+    Mean latency in microseconds of each function of a logic dictionary over sample positions. The
+    batch hooks are called once on all samples and reported per board.
+    """
+    board_shape = np.shape(np.asarray(logic["board"]))
+    mask = np.zeros(logic.get("num_actions", int(np.prod(board_shape))), dtype=bool)
+    batch = np.stack([np.asarray(board, dtype=float) for board, *_ in samples])
+    players = np.array([player.value for _, player, *_ in samples])
+    legal = logic["batch_legal_mask"](batch) if "batch_legal_mask" in logic else None
+    played = [sample for sample in samples if sample[2] is not None]
+
+    calls = {
+        "valid_moves" : lambda: [logic["valid_moves"](board) for board, *_ in samples],
+        "winner" : lambda: [logic["winner"](board) for board, *_ in samples],
+        "legal_mask" : lambda: [logic["legal_mask"](board, mask) for board, *_ in samples],
+        "play" : lambda: [logic["play"](board, player, move, mutate=False) for board, _, move, player in played],
+        "winner_after_move" : lambda: [logic["winner_after_move"](board, player, move) for board, _, move, player in played],
+        "batch_winner" : lambda: logic["batch_winner"](batch),
+        "batch_legal_mask" : lambda: logic["batch_legal_mask"](batch),
+        "batch_play" : lambda: logic["batch_play"](batch.copy(), players, np.argmax(legal, axis=1)),
+    }
+    results = {}
+    for name, call in calls.items():
+        if name not in logic or (name == "batch_play" and legal is None):
+            continue
+        count = len(played) if name in ("play", "winner_after_move") else len(samples)
+        results[f"logic.{name}.latency_us"] = _best_time(call, repeat) / max(count, 1) * 1e6
+    return results
+
+def benchmark_memory(logic, num_games, mean_length) -> dict:
+    """
+    Bytes per stored game, as a list of board copies and in the columnar trajectory format.
+    """
+    board = GameBoard(logic)
+    agentA = Agent(Player.A, random_policy)
+    agentB = Agent(Player.B, random_policy)
+    tracemalloc.start()
+    stored = []
+    for _ in range(num_games):
+        board.reset()
+        game, agent = [], agentA
+        while not board.game_over():
+            board(agent.player, agent(board))
+            game.append(np.array(board.board))
+            agent = agentB if agent is agentA else agentA
+        stored.append(game)
+    stored_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    board_shape = np.shape(np.asarray(logic["board"]))
+    row_bytes = sum(np.dtype(dtype).itemsize*int(np.prod(shape)) for dtype, shape in trajectory_columns(board_shape).values())
+    return {
+        "memory.board_list.bytes_per_game" : stored_bytes / num_games,
+        "memory.trajectory.bytes_per_game" : row_bytes*mean_length,
+    }
+
+def run_benchmarks(logic_name="tictactoe", num_games=1000) -> dict:
+    """
+    Run the benchmark suite on a registered game (see registry.get_game).
+
+    Args:
+    logic_name: str
+    num_games: int
+
+    Returns:
+    dict: {"meta": ..., "results": {metric name: value}}
+    """
+    logic = get_game(logic_name)
+    random.seed(0)
+    results = benchmark_play_loops(logic, num_games)
+    results.update(benchmark_logic_calls(logic, sample_positions(logic)))
+    results.update(benchmark_memory(logic, min(num_games, 200), results["mean_game_length"]))
+    return {
+        "meta" : {
+            "logic" : logic_name,
+            "num_games" : num_games,
+            "python" : platform.python_version(),
+            "numpy" : np.__version__,
+            "machine" : platform.machine(),
+        },
+        "results" : results,
+    }
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    The metrics that regressed by more than threshold (a fraction, e.g. 0.1 for 10%) relative to
+    the baseline.
+
+    Args:
+    results: dict, the output of run_benchmarks
+    baseline: dict, an earlier output of run_benchmarks
+    threshold: float
+
+    Returns:
+    list[str]: One line per regressed metric.
+    """
+    regressions = []
+    for name, base in baseline["results"].items():
+        value = results["results"].get(name)
+        if value is None or base == 0 or name == "mean_game_length":
+            continue
+        if name.endswith(HIGHER_IS_BETTER):
+            change = (base - value) / base
+        else:
+            change = (value - base) / base
+        if change > threshold:
+            regressions.append(f"{name}: {base:.4g} -> {value:.4g} ({100*change:.1f}% worse)")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m board_game_rl.benchmark",
+        description="Measure environment and policy throughput and compare it to a baseline.",
+    )
+    parser.add_argument("--logic", default="tictactoe", choices=available_games())
+    parser.add_argument("--games", type=int, default=1000, help="games per play-loop measurement")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against this JSON file of earlier results")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed regression as a fraction (default 0.10)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the --baseline file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.logic, args.games)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w") as file:
+            file.write(text + "\n")
+    elif args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import enum
 import numpy as np
+from .state_codec import encode_state, zobrist_hash, zobrist_table
 
 class Player(enum.Enum):
     """
@@ -51,17 +52,59 @@ class GameBoard:
     of functions that define the game. The game board is a callable that takes a player
     and a move and returns the new board.
 
+    The status of the board (winner, draw, game over and valid moves) is computed at most
+    once per position and cached until the board is mutated by play(..., mutate=True) or
+    reset(). Code that edits self.board directly must call invalidate() afterwards.
+
+    If the logic provides the optional "winner_after_move(board, player, move)" hook, the
+    winner after each move is found by checking only the lines through that move, and the
+    full "winner" function is used only after reset() or invalidate().
+
+    push(player, move) plays a move and records how to undo it; pop() undoes the last pushed
+    move by restoring only the changed cells and the cached status. By default a move is
+    assumed to change the single cell board[move]. Logic whose moves change other cells can
+    provide "changed_cells(board, player, move)" returning the indices of every cell the move
+    will change, or "unplay(board, player, move)" undoing the move in place; without either,
+    push saves a copy of the whole board.
+
+    Moves also have an integer form, the action. By default the action of move (i, j) is the
+    flat cell index i * cols + j (the row-major cell index on boards of other dimensions, whose
+    moves are cell index tuples, or plain cell indices on 1-D boards); logic with other moves can
+    provide "num_actions", "move_to_action(move)" and "action_to_move(action)". The move of every
+    action is tabulated on first use, so play_action and push_action cost one list index more
+    than play and push, which take moves because the logic functions do; an action outside
+    range(num_actions) is invalid and gives None. legal_mask() returns a boolean mask over the
+    actions, kept in a preallocated array that is updated in place, so it must be copied if it is
+    kept across moves. Logic can fill it directly with the optional "legal_mask(board, out,
+    player=None)" hook; otherwise it is built from valid_moves.
+
+    zobrist_hash() gives the board a stable 64-bit identity. It is computed in full the first
+    time it is asked for and then updated incrementally by play and push from the cells each
+    move changes; encode() gives the exact base-3 code of the board.
+
     Args:
     logic: dict[str, callable]
 
     Methods:
     reset(self) -> tuple
+    set_board(self, board) -> None
+    invalidate(self) -> None
     render(self) -> None
     winner(self) -> Player
     valid_moves(self, player=None) -> list[tuple[int, int]]
+    legal_mask(self, player=None) -> np.ndarray
+    move_to_action(self, move) -> int
+    action_to_move(self, action) -> tuple
+    zobrist_hash(self) -> int
+    encode(self) -> int
     draw(self) -> bool
     game_over(self) -> bool
     play(self, player, move, mutate=True) -> np.ndarray
+    push(self, player, move) -> np.ndarray
+    play_action(self, player, action, mutate=True) -> np.ndarray
+    push_action(self, player, action) -> np.ndarray
+    pop(self) -> tuple
+    num_pushed(self) -> int
     __call__(self, player, move) -> np.ndarray
     __repr__(self) -> str
 
@@ -73,40 +116,237 @@ class GameBoard:
     >>> board.render()
     >>> board.winner()
     >>> board.valid_moves()
+    >>> board.legal_mask()
+    >>> board.zobrist_hash()
     >>> board.draw()
     >>> board.game_over()
     >>> board.play(Player.A, (0, 0))
     >>> board(Player.B, (1, 1))
+    >>> board.play_action(Player.A, 8)
+    >>> board.push(Player.A, (2, 2))
+    >>> board.pop()
     >>> board
     ```
     """
     def __init__(self, logic: dict[str, callable]):
         self.logic = logic
+        self._status = {}
+        self._stack = []
+        self.board_shape = np.shape(np.asarray(logic["board"]))
+        self.num_actions = logic.get("num_actions", int(np.prod(self.board_shape)))
+        # The move of every action, built on first use, so the action API converts an action with
+        # one list index.
+        self._moves = None
+        self._legal_mask = np.zeros(self.num_actions, dtype=bool)
+        self._legal_mask_owner = None
 
     ########################### Logic Methods ###########################
     def reset(self) -> tuple:
         self.board = self.logic["board"].copy()
+        self._status = {}
+        self._stack = []
         return self.board, False
 
+    def set_board(self, board) -> None:
+        # Copy a position (a GameBoard, a board in the format of the logic or, for logic with the
+        # optional "from_array" hook, an ndarray view) into this board.
+        if isinstance(board, GameBoard):
+            board = board.board
+        initial = self.logic["board"]
+        if isinstance(initial, np.ndarray):
+            self.board = np.array(board, dtype=initial.dtype)
+        elif isinstance(board, np.ndarray) and "from_array" in self.logic:
+            self.board = self.logic["from_array"](board)
+        else:
+            self.board = board.copy()
+        self._status = {}
+        self._stack = []
+
+    def invalidate(self) -> None:
+        self._status = {}
+
     def render(self) -> None:
         return self.logic["render"](self.board)
 
     def winner(self) -> Player:
-        return self.logic["winner"](self.board)
+        status = self._status
+        if "winner" not in status:
+            if "last_move" in status:
+                # Only the lines through the last move can have changed the winner.
+                player, move, previous_winner = status["last_move"]
+                if previous_winner == Player.none:
+                    previous_winner = self.logic["winner_after_move"](self.board, player, move)
+                status["winner"] = previous_winner
+            else:
+                status["winner"] = self.logic["winner"](self.board)
+        return status["winner"]
 
     def valid_moves(self, player=None) -> list[tuple[int, int]]:
-        return self.logic["valid_moves"](self.board, player=player)
+        # The cached list is shared between callers and must not be modified.
+        key = ("valid_moves", player)
+        status = self._status
+        if key not in status:
+            status[key] = self.logic["valid_moves"](self.board, player=player)
+        return status[key]
+
+    def legal_mask(self, player=None) -> np.ndarray:
+        # The mask is only valid while the status it was computed for is current.
+        owner = self._legal_mask_owner
+        if owner is None or owner[0] is not self._status or owner[1] != player:
+            if "legal_mask" in self.logic:
+                self.logic["legal_mask"](self.board, self._legal_mask, player=player)
+            else:
+                self._legal_mask[:] = False
+                for move in self.valid_moves(player):
+                    self._legal_mask[self.move_to_action(move)] = True
+            self._legal_mask_owner = (self._status, player)
+        return self._legal_mask
+
+    def move_to_action(self, move) -> int:
+        if "move_to_action" in self.logic:
+            return self.logic["move_to_action"](move)
+        if len(self.board_shape) == 2:
+            return move[0]*self.board_shape[1] + move[1]
+        return int(np.ravel_multi_index(tuple(np.atleast_1d(move)), self.board_shape))
+
+    def _move_table(self) -> list:
+        if self._moves is None:
+            if "action_to_move" in self.logic:
+                self._moves = [self.logic["action_to_move"](action) for action in range(self.num_actions)]
+            elif len(self.board_shape) == 1:
+                # The moves of a 1-D board are its cell indices.
+                self._moves = list(range(self.num_actions))
+            else:
+                self._moves = [
+                    tuple(int(i) for i in np.unravel_index(action, self.board_shape))
+                    for action in range(self.num_actions)
+                ]
+        return self._moves
+
+    def action_to_move(self, action) -> tuple:
+        if not 0 <= action < self.num_actions:
+            raise IndexError(f"Action {action} is outside the {self.num_actions} actions of the game.")
+        return self._move_table()[action]
+
+    def zobrist_hash(self) -> int:
+        status = self._status
+        if "zobrist" not in status:
+            status["zobrist"] = zobrist_hash(self.board)
+        return status["zobrist"]
+
+    def encode(self) -> int:
+        return encode_state(self.board)
+
+    def _changed_cells(self, player, move):
+        # The cells a move will change, or None if the logic cannot tell.
+        if "changed_cells" in self.logic:
+            return self.logic["changed_cells"](self.board, player, move)
+        if isinstance(move, tuple) and len(move) == len(self.board_shape):
+            return (move,)
+        if isinstance(self.board, np.ndarray):
+            # Moves of ndarray boards can also be lists, arrays or, on 1-D boards, ints.
+            cell = tuple(np.atleast_1d(move).tolist())
+            if len(cell) == len(self.board_shape):
+                return (cell,)
+        return None
 
     def play(self, player, move, mutate=True) -> np.ndarray:
-        return self.logic["play"](self.board, player, move, mutate=mutate)
+        if not mutate:
+            return self.logic["play"](self.board, player, move, mutate=False)
+        previous_status = self._status
+        previous_winner = self.winner() if "winner_after_move" in self.logic else None
+        previous_hash = previous_status.get("zobrist")
+        if previous_hash is not None:
+            cells = self._changed_cells(player, move)
+            if cells is not None:
+                old_values = [self.board[cell] for cell in cells]
+        self._status = {}
+        played = self.logic["play"](self.board, player, move, mutate=True)
+        if played is None:
+            self._status = previous_status
+            return played
+        if previous_winner is not None:
+            self._status["last_move"] = (player, move, previous_winner)
+        if previous_hash is not None and cells is not None:
+            # XOR out the old stones and XOR in the new ones.
+            table = zobrist_table(int(np.prod(self.board_shape)))
+            two_dimensional = len(self.board_shape) == 2
+            for cell, old_value in zip(cells, old_values):
+                if two_dimensional:
+                    index = cell[0]*self.board_shape[1] + cell[1]
+                else:
+                    index = int(np.ravel_multi_index(cell, self.board_shape))
+                previous_hash ^= table[index][int(old_value) % 3] ^ table[index][int(self.board[cell]) % 3]
+            self._status["zobrist"] = previous_hash
+        return played
+
+    ########################### Move Stack ###########################
+
+    def push(self, player, move) -> np.ndarray:
+        """
+        Play a move in place and record it so that pop() can undo it. If the move is invalid
+        nothing is recorded and None is returned.
+        """
+        previous_status = self._status
+        saved_cells = saved_board = None
+        if "unplay" not in self.logic:
+            cells = self._changed_cells(player, move)
+            if cells is None:
+                # The changed cells are unknown: save the whole board instead.
+                saved_board = self.board.copy()
+            else:
+                saved_cells = [(cell, self.board[cell]) for cell in cells]
+        played = self.play(player, move, mutate=True)
+        if played is not None:
+            self._stack.append((player, move, saved_cells, saved_board, previous_status))
+        return played
+
+    def play_action(self, player, action, mutate=True) -> np.ndarray:
+        # Like an invalid move, an action outside the action space plays nothing and gives None.
+        if not 0 <= action < self.num_actions:
+            return None
+        return self.play(player, self._move_table()[action], mutate=mutate)
+
+    def push_action(self, player, action) -> np.ndarray:
+        if not 0 <= action < self.num_actions:
+            return None
+        return self.push(player, self._move_table()[action])
+
+    def pop(self) -> tuple:
+        """
+        Undo the last pushed move and return the (player, move) that was undone.
+        """
+        if not self._stack:
+            raise ValueError("There is no pushed move to undo.")
+        player, move, saved_cells, saved_board, previous_status = self._stack.pop()
+        if saved_cells is not None:
+            for cell, value in saved_cells:
+                self.board[cell] = value
+        elif saved_board is None:
+            self.logic["unplay"](self.board, player, move)
+        elif isinstance(self.board, np.ndarray):
+            self.board[...] = saved_board
+        else:
+            self.board = saved_board
+        self._status = previous_status
+        return player, move
+
+    def num_pushed(self) -> int:
+        return len(self._stack)
 
     ########################### Derived Game Methods ###########################
 
     def draw(self) -> bool:
-        return len(self.valid_moves()) == 0 and self.winner() == Player.none
+        status = self._status
+        if "draw" not in status:
+            status["draw"] = len(self.valid_moves()) == 0 and self.winner() == Player.none
+        return status["draw"]
 
     def game_over(self) -> bool:
-        return self.winner() != Player.none or self.draw()
+        status = self._status
+        if "game_over" not in status:
+            status["game_over"] = self.winner() != Player.none or self.draw()
+        return status["game_over"]
 
     ############################# Magic Methods ###########################
 
@@ -115,3 +355,60 @@ class GameBoard:
 
     def __repr__(self) -> str:
         return self.board.__repr__()
+
+class BatchAgent:
+    """
+    A batch agent is a player (class) with a batch policy (callable). The batch policy takes a
+    stack of observations of shape (B, rows, cols), the matching legal-action masks of shape
+    (B, num_actions) and the player, and returns one integer action per observation. It lets a
+    policy such as a neural network decide for many games in a single call.
+
+    Single-board policies like random_policy are adapted with BatchAgent.from_policy, which calls
+    the policy once per observation.
+
+    Args:
+    player: Player
+    batch_policy: callable
+
+    Methods:
+    __call__(self, observations: np.ndarray, masks: np.ndarray) -> np.ndarray
+    from_policy(cls, player, policy, logic) -> BatchAgent
+    __repr__(self) -> Player
+
+    Example:
+    ```python
+    >>> import numpy as np
+    >>> from board_classes import BatchAgent, Player
+    >>> def first_legal_action(observations, masks, player):
+    ...     return np.argmax(masks, axis=1)
+    >>> agentA = BatchAgent(Player.A, first_legal_action)
+    >>> agentB = BatchAgent.from_policy(Player.B, random_policy, tictactoe_logic)
+    ```
+    """
+    def __init__(self, player: Player, batch_policy: callable):
+        self.player = player
+        self.batch_policy = batch_policy
+        self.value = self.player.value
+
+    def __call__(self, observations, masks) -> np.ndarray:
+        return np.asarray(self.batch_policy(observations, masks, self.player))
+
+    def __repr__(self) -> Player:
+        return self.player
+
+    @classmethod
+    def from_policy(cls, player: Player, policy: callable, logic: dict[str, callable]):
+        """
+        Adapt a single-board policy, called as policy(board, player) with a GameBoard, to a batch agent.
+        """
+        board = GameBoard(logic)
+        board.reset()
+
+        def batch_policy(observations, masks, player):
+            actions = np.empty(len(observations), dtype=np.int64)
+            for i, observation in enumerate(observations):
+                board.set_board(observation)
+                actions[i] = board.move_to_action(policy(board, player))
+            return actions
+
+        return cls(player, batch_policy)
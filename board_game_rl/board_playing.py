@@ -1,7 +1,91 @@
-from .board_classes import Player, Agent
+from .board_classes import Player, Agent, BatchAgent, GameBoard
 from .example_policies.random_policy import random_policy
 import numpy as np
 
+def play_game(board, agentA: Agent, agentB: Agent) -> tuple[Player, int]:
+    """
+    Play a game on the board with two agents without rendering or printing. Agent A moves first.
+
+    Args:
+    board: GameBoard
+    agentA: Agent
+    agentB: Agent
+
+    Returns:
+    tuple[Player, int]: The winner (Player.none for a draw) and the number of moves played.
+    """
+    # Reset the board to begin the game.
+    board.reset()
+
+    # Play the game.
+    current_agent = agentA
+    num_moves = 0
+    while True:
+        # Current agent makes a move.
+        move = current_agent(board)
+        board(current_agent.player, move)
+        num_moves += 1
+
+        # Check if the game is over.
+        if board.game_over():
+            return board.winner(), num_moves
+
+        # Switch agents.
+        current_agent = agentA if current_agent is agentB else agentB
+
+def play_batched_games(logic: dict, agentA, agentB, num_games: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Play many games between two agents at the same time without rendering or printing. At every ply
+    the decisions of all unfinished games are collected into one batch and sent to the agent to move
+    in a single call. Agents are BatchAgents; a plain Agent is adapted with BatchAgent.from_policy.
+
+    Args:
+    logic: dict[str, callable]
+    agentA: BatchAgent or Agent, moves first
+    agentB: BatchAgent or Agent
+    num_games: int
+
+    Returns:
+    tuple[np.ndarray, np.ndarray]: The value of the winner of each game (Player.none.value for a
+    draw) and the number of moves of each game.
+    """
+    # Adapt single-board agents.
+    agents = [
+        agent if isinstance(agent, BatchAgent) else BatchAgent.from_policy(agent.player, agent.policy, logic)
+        for agent in (agentA, agentB)
+    ]
+
+    # Start all the games.
+    boards = [GameBoard(logic) for _ in range(num_games)]
+    for board in boards:
+        board.reset()
+    winners = np.full(num_games, Player.none.value)
+    game_lengths = np.zeros(num_games, dtype=np.int32)
+    active = list(range(num_games))
+
+    # Play the games.
+    ply = 0
+    while active:
+        # Collect the pending decisions into one batch for the agent to move.
+        agent = agents[ply % 2]
+        observations = np.stack([np.asarray(boards[game].board, dtype=float) for game in active])
+        masks = np.stack([boards[game].legal_mask(agent.player) for game in active])
+        actions = agent(observations, masks)
+
+        # Play the moves and retire the finished games.
+        still_active = []
+        for game, action in zip(active, actions):
+            board = boards[game]
+            board.play_action(agent.player, action)
+            game_lengths[game] += 1
+            if board.game_over():
+                winners[game] = board.winner().value
+            else:
+                still_active.append(game)
+        active = still_active
+        ply += 1
+    return winners, game_lengths
+
 def play_simulated_random_game(board:np.ndarray, render=False) -> None:
     """
     Play a random game on the board.
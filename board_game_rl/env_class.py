@@ -1,17 +1,28 @@
+import numpy as np
 from .board_classes import GameBoard, Player
+from .observation import ObservationEncoder
+from .symmetry import logic_symmetries
 
 class GameEnv:
-    def __init__(self, game_logic):
+    def __init__(self, game_logic, recorder=None, encode_observations=False, canonical=False):
         """
         Initialize the board game environment with the specific game logic.
 
         Args:
         game_logic (dict): A dictionary containing the game logic functions.
+        recorder (TrajectoryRecorder): If given, every step is recorded as a transition.
+        encode_observations (bool): If True, reset and step return the encoded planes of observe()
+            for the player to move next instead of the live board.
+        canonical (bool): If True, encoded observations are mapped to their canonical symmetry.
         """
         self.game_board = GameBoard(game_logic)
+        self.recorder = recorder
+        self.encoder = ObservationEncoder(
+            self.game_board.board_shape, canonical=canonical, symmetries=logic_symmetries(game_logic)
+        )
+        self.encode_observations = encode_observations
         self.done = False
         self.winner = Player.none
-        self.observations = []
 
     def reset(self):
         """
@@ -23,7 +34,8 @@ class GameEnv:
         self.game_board.reset()
         self.done = False
         self.winner = Player.none
-        self.observations = [self.game_board]
+        if self.encode_observations:
+            return self.observe(Player.A), self.done
         return self.game_board, self.done
 
     def step(self, player, move):
@@ -40,7 +52,10 @@ class GameEnv:
         if self.done:
             raise ValueError("The game is over. Please reset the environment.")
 
-        new_state = self.game_board.play(player, move)
+        if self.recorder is not None:
+            state = np.array(self.game_board.board, dtype=np.int8)
+
+        new_state = self.game_board.push(player, move)
 
         # Check if the game is over and update the winner
         if self.game_board.game_over():
@@ -50,8 +65,54 @@ class GameEnv:
         # Define the reward mechanism
         reward = self.calculate_reward(player)
 
+        # An invalid move leaves the board unchanged (push returns None), so there is no transition.
+        if self.recorder is not None and new_state is not None:
+            action = self.game_board.move_to_action(move)
+            self.recorder.record(state, action, player, reward, self.done, new_state)
+
+        if self.encode_observations:
+            new_state = self.observe(Player.B if player.value == Player.A.value else Player.A)
+
         return new_state, reward, self.done
 
+    def observe(self, player):
+        """
+        Encode the current board as player-relative planes (own stones, opponent stones, side to move).
+        The planes are written into a buffer that is reused by every call.
+
+        Args:
+        player (Player): The player whose point of view is encoded.
+
+        Returns:
+        np.ndarray: A read-only view of shape (3, rows, cols).
+        """
+        return self.encoder.encode(self.game_board.board, player)
+
+    def step_action(self, player, action):
+        """
+        Take a step in the environment with the move given as an integer action.
+
+        Args:
+        player (Player): The player making the move.
+        action (int): The action being taken, see GameBoard.action_to_move.
+
+        Returns:
+        tuple: A tuple containing the new state of the board, the reward, and a boolean indicating if the game is over.
+        """
+        return self.step(player, self.game_board.action_to_move(action))
+
+    def legal_mask(self, player=None):
+        """
+        Return the boolean mask of the legal actions. The mask is updated in place after each step.
+
+        Args:
+        player (Player): The player to move.
+
+        Returns:
+        np.ndarray: The legal-action mask.
+        """
+        return self.game_board.legal_mask(player=player)
+
     def calculate_reward(self, player):
         """
         Calculate the reward for the given player.
@@ -73,9 +134,17 @@ class GameEnv:
 
     def revert(self):
         """
-        Revert the environment to the previous state.
+        Revert the environment to the previous state by undoing the last move.
+
+        Returns:
+        tuple: The (player, move) that was undone.
         """
-        self.observations = self.observations[:-1]
+        if self.game_board.num_pushed() == 0:
+            raise ValueError("There is no move to revert.")
+        undone = self.game_board.pop()
+        self.done = self.game_board.game_over()
+        self.winner = self.game_board.winner()
+        return undone
 
     def render(self):
         """
@@ -0,0 +1,313 @@
+import numpy as np
+from board_game_rl.board_classes import Player
+from board_game_rl.example_logic.mnk_logic import mnk_render
+from board_game_rl.symmetry import symmetry_permutations
+
+ROWS = 6
+COLUMNS = 7
+
+# Column c of the board is bits 7*c to 7*c + 6 of an integer, bottom cell first. The top bit of
+# each column is always empty, so shifting a line of stones past the top of one column never
+# lands in the next column.
+HEIGHT = ROWS + 1
+
+# The shifts between neighbouring cells of a line: vertical, horizontal and the two diagonals.
+SHIFTS = (1, HEIGHT, HEIGHT - 1, HEIGHT + 1)
+
+# CELL_SHIFTS[i, j] is the bit of cell (i, j) of the ndarray view, whose row 0 is the top row.
+CELL_SHIFTS = HEIGHT*np.arange(COLUMNS) + (ROWS - 1 - np.arange(ROWS))[:, np.newaxis]
+CELL_SHIFTS.setflags(write=False)
+CELL_BITS = (np.uint64(1) << CELL_SHIFTS.astype(np.uint64)).ravel()
+CELL_BITS.setflags(write=False)
+
+# Gravity rules out the vertical reflection and the half turn, so the only symmetries are the
+# identity and the left-right reflection, which maps column c to column COLUMNS - 1 - c.
+SYMMETRIES = (
+    symmetry_permutations((ROWS, COLUMNS))[[0, 2]],
+    np.array([np.arange(COLUMNS), np.arange(COLUMNS)[::-1]]),
+)
+SYMMETRIES[1].setflags(write=False)
+
+def _has_four(bits: int) -> bool:
+    # Two shifts per direction find four stones in a row: pairs marks the start of two in a row,
+    # and two pairs 2*shift apart make four.
+    for shift in SHIFTS:
+        pairs = bits & (bits >> shift)
+        if pairs & (pairs >> 2*shift):
+            return True
+    return False
+
+class ConnectFourBitboard:
+    """
+    A Connect Four board stored as two integers, one per player, with the height of every column.
+    Like TicTacToeBitboard, the 6x7 ndarray view (row 0 at the top) is built only when it is asked
+    for and is cached until the next move.
+
+    Args:
+    a: int, the cells occupied by Player.A
+    b: int, the cells occupied by Player.B
+    heights: list[int], the number of stones in each column
+
+    Example:
+    ```python
+    >>> from connect_four_logic import ConnectFourBitboard, connect_four_play_logic
+    >>> board = ConnectFourBitboard()
+    >>> connect_four_play_logic(board, Player.A, 3)
+    >>> board[5, 3]
+    1.0
+    ```
+    """
+    __slots__ = ("a", "b", "heights", "_array")
+
+    def __init__(self, a=0, b=0, heights=None):
+        self.a = a
+        self.b = b
+        self.heights = [0]*COLUMNS if heights is None else list(heights)
+        self._array = None
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        Build a bitboard from a 6x7 ndarray board.
+        """
+        cells = np.asarray(array).reshape(ROWS, COLUMNS)
+        a = int(CELL_BITS[(cells == Player.A.value).ravel()].sum())
+        b = int(CELL_BITS[(cells == Player.B.value).ravel()].sum())
+        return cls(a, b, np.count_nonzero(cells != Player.none.value, axis=0).tolist())
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        The read-only 6x7 ndarray view of the board.
+        """
+        if self._array is None:
+            array = (self.a >> CELL_SHIFTS & 1) * Player.A.value + (self.b >> CELL_SHIFTS & 1) * Player.B.value
+            array = array.astype(float)
+            array.setflags(write=False)
+            self._array = array
+        return self._array
+
+    def copy(self):
+        return ConnectFourBitboard(self.a, self.b, self.heights)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.array
+        return self.array.astype(dtype)
+
+    def __getitem__(self, index):
+        return self.array[index]
+
+    def __eq__(self, other):
+        if isinstance(other, ConnectFourBitboard):
+            return self.a == other.a and self.b == other.b
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.a, self.b))
+
+    def __repr__(self) -> str:
+        return self.array.__repr__()
+
+def connect_four_play_logic(board: ConnectFourBitboard, player: Player, move: int, mutate=True):
+    """
+    The logic of dropping a stone into column move. If mutate is False a new board is returned, and
+    if the column is full or does not exist the function returns None.
+
+    Args:
+    board: ConnectFourBitboard
+    player: Player
+    move: int, the column
+    mutate: bool
+
+    Returns:
+    ConnectFourBitboard
+    """
+    if not 0 <= move < COLUMNS:
+        return None
+    height = board.heights[move]
+    if height == ROWS:
+        return None
+    played_board = board if mutate else board.copy()
+    bit = 1 << (HEIGHT*move + height)
+    if player.value == Player.A.value:
+        played_board.a |= bit
+    else:
+        played_board.b |= bit
+    played_board.heights[move] = height + 1
+    played_board._array = None
+    return played_board
+
+def connect_four_unplay_logic(board: ConnectFourBitboard, player: Player, move: int):
+    """
+    The logic of undoing the last move in column move by removing its top stone.
+
+    Args:
+    board: ConnectFourBitboard
+    player: Player
+    move: int
+
+    Returns:
+    ConnectFourBitboard
+    """
+    board.heights[move] -= 1
+    bit = 1 << (HEIGHT*move + board.heights[move])
+    board.a &= ~bit
+    board.b &= ~bit
+    board._array = None
+    return board
+
+def connect_four_changed_cells(board: ConnectFourBitboard, player: Player, move: int) -> tuple:
+    """
+    The cell of the ndarray view that dropping a stone into column move will fill, which lets
+    GameBoard update its Zobrist hash incrementally.
+    """
+    if not 0 <= move < COLUMNS or board.heights[move] == ROWS:
+        return ()
+    return ((ROWS - 1 - board.heights[move], move),)
+
+def connect_four_valid_moves(board: ConnectFourBitboard, player=None) -> list[int]:
+    """
+    The logic of finding the valid moves of Connect Four: the columns that are not full.
+
+    Args:
+    board: ConnectFourBitboard
+    player: Player
+
+    Returns:
+    list[int]
+    """
+    return [column for column, height in enumerate(board.heights) if height < ROWS]
+
+def connect_four_legal_mask(board: ConnectFourBitboard, out, player=None) -> np.ndarray:
+    """
+    The logic of finding the legal moves of Connect Four as a boolean mask over the columns, written
+    into the preallocated array out.
+
+    Args:
+    board: ConnectFourBitboard
+    out: np.ndarray of shape (7,) and dtype bool
+    player: Player
+
+    Returns:
+    np.ndarray
+    """
+    return np.less(board.heights, ROWS, out=out)
+
+def connect_four_winner(board: ConnectFourBitboard) -> Player:
+    """
+    The logic of finding the winner of Connect Four with shift-based four-in-a-row detection.
+
+    Args:
+    board: ConnectFourBitboard
+
+    Returns:
+    Player
+    """
+    if _has_four(board.a):
+        return Player.A
+    elif _has_four(board.b):
+        return Player.B
+    else:
+        return Player.none
+
+def connect_four_winner_after_move(board: ConnectFourBitboard, player: Player, move: int) -> Player:
+    """
+    The logic of finding the winner right after player dropped a stone, assuming nobody had won
+    before it: only the stones of player need to be checked.
+
+    Args:
+    board: ConnectFourBitboard
+    player: Player
+    move: int
+
+    Returns:
+    Player
+    """
+    if player.value == Player.A.value:
+        return Player.A if _has_four(board.a) else Player.none
+    return Player.B if _has_four(board.b) else Player.none
+
+def connect_four_move_to_action(move: int) -> int:
+    return int(move)
+
+def connect_four_action_to_move(action: int) -> int:
+    return int(action)
+
+########################### Batched Logic ###########################
+
+def connect_four_batch_winner(boards) -> np.ndarray:
+    """
+    The logic of finding the winners of a batch of Connect Four boards at once. Each board is packed
+    into a 64-bit bitboard per player and checked with the same shifts as connect_four_winner.
+
+    Args:
+    boards: np.ndarray of shape (N, 6, 7)
+
+    Returns:
+    np.ndarray of shape (N,) holding Player.A.value, Player.B.value or Player.none.value
+    """
+    boards = np.asarray(boards).reshape(-1, ROWS*COLUMNS)
+    winners = np.full(len(boards), Player.none.value)
+    for player in (Player.B, Player.A):
+        bits = np.bitwise_or.reduce(np.where(boards == player.value, CELL_BITS, np.uint64(0)), axis=1)
+        found = np.zeros(len(boards), dtype=bool)
+        for shift in SHIFTS:
+            pairs = bits & (bits >> np.uint64(shift))
+            found |= (pairs & (pairs >> np.uint64(2*shift))) != 0
+        winners[found] = player.value
+    return winners
+
+def connect_four_batch_legal_mask(boards) -> np.ndarray:
+    """
+    The logic of finding the legal moves of a batch of Connect Four boards: the columns whose top
+    cell is empty.
+
+    Args:
+    boards: np.ndarray of shape (N, 6, 7)
+
+    Returns:
+    np.ndarray of shape (N, 7) and dtype bool
+    """
+    return np.asarray(boards)[:, 0, :] == Player.none.value
+
+def connect_four_batch_play(boards, players, actions) -> np.ndarray:
+    """
+    The logic of dropping one stone (into a column that is not full) on each board of a batch of
+    Connect Four boards, in place.
+
+    Args:
+    boards: np.ndarray of shape (N, 6, 7)
+    players: np.ndarray of shape (N,)
+    actions: np.ndarray of shape (N,), the columns
+
+    Returns:
+    np.ndarray
+    """
+    index = np.arange(len(boards))
+    actions = np.asarray(actions)
+    heights = np.count_nonzero(boards[index, :, actions] != Player.none.value, axis=1)
+    boards[index, ROWS - 1 - heights, actions] = players
+    return boards
+
+# Each value is a function expressing the logic of Connect Four. Moves and actions are both the
+# column to drop a stone into.
+connect_four_logic = {
+    "valid_moves" : connect_four_valid_moves,
+    "legal_mask" : connect_four_legal_mask,
+    "play" : connect_four_play_logic,
+    "unplay" : connect_four_unplay_logic,
+    "changed_cells" : connect_four_changed_cells,
+    "board" : ConnectFourBitboard(),
+    "from_array" : ConnectFourBitboard.from_array,
+    "render" : mnk_render,
+    "winner" : connect_four_winner,
+    "winner_after_move" : connect_four_winner_after_move,
+    "num_actions" : COLUMNS,
+    "move_to_action" : connect_four_move_to_action,
+    "action_to_move" : connect_four_action_to_move,
+    "symmetries" : SYMMETRIES,
+    "batch_winner" : connect_four_batch_winner,
+    "batch_legal_mask" : connect_four_batch_legal_mask,
+    "batch_play" : connect_four_batch_play,
+}
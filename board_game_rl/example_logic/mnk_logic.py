@@ -0,0 +1,251 @@
+import functools
+import numpy as np
+from board_game_rl.board_classes import Player
+
+# The four line directions through a cell: horizontal, vertical and the two diagonals.
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+@functools.lru_cache(maxsize=None)
+def mnk_lines(m: int, n: int, k: int) -> np.ndarray:
+    """
+    The flat cell indices of every line of k consecutive cells on an m x n board.
+
+    Args:
+    m: int, the number of rows
+    n: int, the number of columns
+    k: int, the number in a row needed to win
+
+    Returns:
+    np.ndarray of shape (L, k)
+
+    Example:
+    ```python
+    >>> from mnk_logic import mnk_lines
+    >>> mnk_lines(3, 3, 3).shape
+    (8, 3)
+    ```
+    """
+    lines = []
+    for x in range(m):
+        for y in range(n):
+            for dx, dy in DIRECTIONS:
+                end_x, end_y = x + (k - 1)*dx, y + (k - 1)*dy
+                if 0 <= end_x < m and 0 <= end_y < n:
+                    lines.append([(x + t*dx)*n + (y + t*dy) for t in range(k)])
+    lines = np.array(lines, dtype=np.intp).reshape(-1, k)
+    lines.setflags(write=False)
+    return lines
+
+def mnk_play_logic(board, player: Player, move: tuple, mutate=True):
+    """
+    The logic of playing a move in an m,n,k-game. Behaves like tictactoe_play_logic: if mutate is False a
+    new board is returned, and if the move is invalid the function returns None.
+
+    Args:
+    board: np.ndarray
+    player: Player
+    move: tuple[int, int]
+    mutate: bool
+
+    Returns:
+    np.ndarray
+    """
+    x, y = move
+    if board[x, y] != Player.none.value:
+        return None
+    played_board = board if mutate else board.copy()
+    played_board[x, y] = player.value
+    return played_board
+
+def mnk_valid_moves(board, player=None) -> list[tuple[int, int]]:
+    """
+    The logic of finding the valid moves in an m,n,k-game: every empty cell.
+
+    Args:
+    board: np.ndarray
+    player: Player
+
+    Returns:
+    list[tuple[int, int]]
+    """
+    return [tuple(cell) for cell in np.argwhere(board == Player.none.value).tolist()]
+
+def mnk_legal_mask(board, out, player=None) -> np.ndarray:
+    """
+    The logic of finding the legal moves in an m,n,k-game as a boolean mask over the flat cell indices
+    (action = n*row + column), written into the preallocated array out.
+
+    Args:
+    board: np.ndarray
+    out: np.ndarray of shape (m*n,) and dtype bool
+    player: Player
+
+    Returns:
+    np.ndarray
+    """
+    return np.equal(board.reshape(-1), Player.none.value, out=out)
+
+def mnk_render(board):
+    """
+    The logic of rendering an m,n,k-game board.
+
+    Args:
+    board: np.ndarray
+
+    Returns:
+    None
+    """
+    from tabulate import tabulate
+    symbols = {Player.none.value: "-", Player.A.value: "X", Player.B.value: "O"}
+    rendered_board = [[symbols[cell] for cell in row] for row in np.asarray(board).tolist()]
+    print(tabulate(rendered_board, tablefmt="fancy_grid"))
+
+def mnk_batch_winner(boards, k: int) -> np.ndarray:
+    """
+    The logic of finding the winners of a batch of m,n,k-game boards at once.
+
+    Args:
+    boards: np.ndarray of shape (N, m, n)
+    k: int
+
+    Returns:
+    np.ndarray of shape (N,) holding Player.A.value, Player.B.value or Player.none.value
+    """
+    boards = np.asarray(boards)
+    num_boards, m, n = boards.shape
+    line_sums = boards.reshape(num_boards, m*n)[:, mnk_lines(m, n, k)].sum(axis=2)
+    winners = np.full(num_boards, Player.none.value)
+    winners[(line_sums == k*Player.B.value).any(axis=1)] = Player.B.value
+    winners[(line_sums == k*Player.A.value).any(axis=1)] = Player.A.value
+    return winners
+
+def mnk_batch_legal_mask(boards) -> np.ndarray:
+    """
+    The logic of finding the legal moves of a batch of m,n,k-game boards, as boolean masks over the flat
+    cell indices (action = n*row + column).
+
+    Args:
+    boards: np.ndarray of shape (N, m, n)
+
+    Returns:
+    np.ndarray of shape (N, m*n) and dtype bool
+    """
+    boards = np.asarray(boards)
+    return boards.reshape(len(boards), -1) == Player.none.value
+
+def mnk_batch_play(boards, players, actions) -> np.ndarray:
+    """
+    The logic of playing one (legal) move on each board of a batch of m,n,k-game boards, in place.
+
+    Args:
+    boards: np.ndarray of shape (N, m, n)
+    players: np.ndarray of shape (N,)
+    actions: np.ndarray of shape (N,)
+
+    Returns:
+    np.ndarray
+    """
+    rows, cols = np.divmod(np.asarray(actions), boards.shape[2])
+    boards[np.arange(len(boards)), rows, cols] = players
+    return boards
+
+def mnk_winner(board, k: int) -> Player:
+    """
+    The logic of finding the winner of an m,n,k-game by scanning the whole board.
+
+    Args:
+    board: np.ndarray
+    k: int
+
+    Returns:
+    Player
+    """
+    winner = mnk_batch_winner(np.asarray(board)[np.newaxis], k)[0]
+    if winner == Player.A.value:
+        return Player.A
+    elif winner == Player.B.value:
+        return Player.B
+    else:
+        return Player.none
+
+def mnk_winner_after_move(board, player: Player, move: tuple, k: int) -> Player:
+    """
+    The logic of finding the winner of an m,n,k-game right after move was played, assuming nobody had
+    won before it. Only the four lines through the played cell are walked, so the cost is O(k) instead
+    of O(m*n). The stone is read from the board, so player is only part of the hook signature.
+
+    Args:
+    board: np.ndarray
+    player: Player
+    move: tuple[int, int]
+    k: int
+
+    Returns:
+    Player
+
+    Example:
+    ```python
+    >>> from mnk_logic import mnk_winner_after_move
+    >>> import numpy as np
+    >>> board = np.zeros((15, 15))
+    >>> board[7, 3:8] = 1.0
+    >>> mnk_winner_after_move(board, Player.A, (7, 5), k=5)
+    Player.A
+    ```
+    """
+    m, n = board.shape
+    x, y = move
+    value = board[x, y]
+    if value == Player.none.value:
+        return Player.none
+    for dx, dy in DIRECTIONS:
+        count = 1
+        i, j = x + dx, y + dy
+        while 0 <= i < m and 0 <= j < n and board[i, j] == value:
+            count += 1
+            i, j = i + dx, j + dy
+        i, j = x - dx, y - dy
+        while 0 <= i < m and 0 <= j < n and board[i, j] == value:
+            count += 1
+            i, j = i - dx, j - dy
+        if count >= k:
+            return Player.A if value == Player.A.value else Player.B
+    return Player.none
+
+def mnk_logic(m: int, n: int, k: int) -> dict:
+    """
+    Build the logic dictionary of the m,n,k-game: two players alternately place stones on an m x n
+    board and the first to get k in a row (horizontally, vertically or diagonally) wins. The logic
+    provides the "winner_after_move" hook, so GameBoard only checks the lines through each new stone.
+
+    Args:
+    m: int, the number of rows
+    n: int, the number of columns
+    k: int, the number in a row needed to win
+
+    Returns:
+    dict[str, callable]
+
+    Example:
+    ```python
+    >>> from mnk_logic import mnk_logic
+    >>> from board_classes import GameBoard
+    >>> board = GameBoard(mnk_logic(15, 15, 5))
+    >>> board.reset()
+    ```
+    """
+    return {
+        "valid_moves" : mnk_valid_moves,
+        "legal_mask" : mnk_legal_mask,
+        "play" : mnk_play_logic,
+        "board" : np.zeros((m, n)),
+        "render" : mnk_render,
+        "winner" : functools.partial(mnk_winner, k=k),
+        "winner_after_move" : functools.partial(mnk_winner_after_move, k=k),
+        "batch_winner" : functools.partial(mnk_batch_winner, k=k),
+        "batch_legal_mask" : mnk_batch_legal_mask,
+        "batch_play" : mnk_batch_play,
+    }
+
+# Gomoku (free-style): five in a row on a 15 x 15 board.
+gomoku_logic = mnk_logic(15, 15, 5)
@@ -0,0 +1,230 @@
+import numpy as np
+from board_game_rl.board_classes import Player
+from board_game_rl.example_logic.tictactoe_logic import (
+    tictactoe_render,
+    tictactoe_batch_winner,
+    tictactoe_batch_legal_mask,
+    tictactoe_batch_play,
+)
+
+# Cell (i, j) of the board is bit 3*i + j of a 9-bit integer.
+FULL_MASK = 0b111111111
+
+# The eight winning lines (rows, columns, diagonals) as bit masks.
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+)
+
+# WINNING_BITS[bits] is True when the 9-bit pattern bits contains a winning line.
+WINNING_BITS = tuple(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(FULL_MASK + 1))
+
+# MOVES_BY_EMPTY[bits] lists the (i, j) cells that are set in the 9-bit pattern bits.
+MOVES_BY_EMPTY = tuple(
+    tuple(divmod(cell, 3) for cell in range(9) if bits >> cell & 1) for bits in range(FULL_MASK + 1)
+)
+
+# MASK_BY_EMPTY[bits] is the boolean mask over the 9 cells of the 9-bit pattern bits.
+MASK_BY_EMPTY = (np.arange(FULL_MASK + 1)[:, np.newaxis] >> np.arange(9) & 1).astype(bool)
+MASK_BY_EMPTY.setflags(write=False)
+
+class TicTacToeBitboard:
+    """
+    A TicTacToe board stored as two 9-bit integers, one per player. The ndarray view of the board
+    is built only when it is asked for (np.asarray(board), board.array or indexing) and is cached
+    until the next move.
+
+    Args:
+    a: int, the cells occupied by Player.A
+    b: int, the cells occupied by Player.B
+
+    Example:
+    ```python
+    >>> from tictactoe_bitboard_logic import TicTacToeBitboard
+    >>> board = TicTacToeBitboard()
+    >>> board.a |= 1 << 4
+    >>> board[1, 1]
+    1.0
+    ```
+    """
+    __slots__ = ("a", "b", "_array")
+
+    def __init__(self, a=0, b=0):
+        self.a = a
+        self.b = b
+        self._array = None
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        Build a bitboard from a 3x3 ndarray board.
+        """
+        cells = np.asarray(array).reshape(9)
+        weights = 1 << np.arange(9)
+        a = int(weights[cells == Player.A.value].sum())
+        b = int(weights[cells == Player.B.value].sum())
+        return cls(a, b)
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        The read-only 3x3 ndarray view of the board.
+        """
+        if self._array is None:
+            cells = np.arange(9)
+            array = (self.a >> cells & 1) * Player.A.value + (self.b >> cells & 1) * Player.B.value
+            array = array.reshape(3, 3).astype(float)
+            array.setflags(write=False)
+            self._array = array
+        return self._array
+
+    @property
+    def empty(self) -> int:
+        """
+        The bit mask of the empty cells.
+        """
+        return ~(self.a | self.b) & FULL_MASK
+
+    def copy(self):
+        return TicTacToeBitboard(self.a, self.b)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.array
+        return self.array.astype(dtype)
+
+    def __getitem__(self, index):
+        return self.array[index]
+
+    def __eq__(self, other):
+        if isinstance(other, TicTacToeBitboard):
+            return self.a == other.a and self.b == other.b
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.a, self.b))
+
+    def __repr__(self) -> str:
+        return self.array.__repr__()
+
+def tictactoe_bitboard_play_logic(board: TicTacToeBitboard, player: Player, move: tuple, mutate=True):
+    """
+    The logic of playing a move on a TicTacToe bitboard. Behaves like tictactoe_play_logic: if mutate is
+    False a new board is returned, and if the move is invalid the function returns None.
+
+    Args:
+    board: TicTacToeBitboard
+    player: Player
+    move: tuple[int, int]
+    mutate: bool
+
+    Returns:
+    TicTacToeBitboard
+    """
+    x, y = move
+    bit = 1 << (3*x + y)
+    if (board.a | board.b) & bit:
+        return None
+    played_board = board if mutate else board.copy()
+    if player.value == Player.A.value:
+        played_board.a |= bit
+    else:
+        played_board.b |= bit
+    played_board._array = None
+    return played_board
+
+def tictactoe_bitboard_unplay_logic(board: TicTacToeBitboard, player: Player, move: tuple):
+    """
+    The logic of undoing a move on a TicTacToe bitboard by clearing its cell.
+
+    Args:
+    board: TicTacToeBitboard
+    player: Player
+    move: tuple[int, int]
+
+    Returns:
+    TicTacToeBitboard
+    """
+    x, y = move
+    bit = 1 << (3*x + y)
+    board.a &= ~bit
+    board.b &= ~bit
+    board._array = None
+    return board
+
+def tictactoe_bitboard_valid_moves(board: TicTacToeBitboard, player=None) -> list[tuple[int, int]]:
+    """
+    The logic of finding the valid moves on a TicTacToe bitboard, read from a precomputed table indexed
+    by the mask of empty cells.
+
+    Args:
+    board: TicTacToeBitboard
+    player: Player
+
+    Returns:
+    list[tuple[int, int]]
+    """
+    return list(MOVES_BY_EMPTY[~(board.a | board.b) & FULL_MASK])
+
+def tictactoe_bitboard_legal_mask(board: TicTacToeBitboard, out, player=None) -> np.ndarray:
+    """
+    The logic of finding the legal moves on a TicTacToe bitboard as a boolean mask over the flat cell
+    indices, copied from a precomputed table into the preallocated array out.
+
+    Args:
+    board: TicTacToeBitboard
+    out: np.ndarray of shape (9,) and dtype bool
+    player: Player
+
+    Returns:
+    np.ndarray
+    """
+    out[:] = MASK_BY_EMPTY[~(board.a | board.b) & FULL_MASK]
+    return out
+
+def tictactoe_bitboard_winner(board: TicTacToeBitboard) -> Player:
+    """
+    The logic of finding the winner on a TicTacToe bitboard, by checking each player's bits against
+    the precomputed winning lines.
+
+    Args:
+    board: TicTacToeBitboard
+
+    Returns:
+    Player
+    """
+    if WINNING_BITS[board.a]:
+        return Player.A
+    elif WINNING_BITS[board.b]:
+        return Player.B
+    else:
+        return Player.none
+
+def tictactoe_bitboard_render(board: TicTacToeBitboard):
+    """
+    The logic of rendering a TicTacToe bitboard.
+
+    Args:
+    board: TicTacToeBitboard
+
+    Returns:
+    None
+    """
+    tictactoe_render(board.array)
+
+# Each value is a function expressing the logic of TicTacToe on bitboards. The batched hooks work on
+# ndarray stacks and are shared with tictactoe_logic.
+tictactoe_bitboard_logic = {
+    "valid_moves" : tictactoe_bitboard_valid_moves,
+    "legal_mask" : tictactoe_bitboard_legal_mask,
+    "play" : tictactoe_bitboard_play_logic,
+    "unplay" : tictactoe_bitboard_unplay_logic,
+    "board" : TicTacToeBitboard(),
+    "from_array" : TicTacToeBitboard.from_array,
+    "render" : tictactoe_bitboard_render,
+    "winner" : tictactoe_bitboard_winner,
+    "batch_winner" : tictactoe_batch_winner,
+    "batch_legal_mask" : tictactoe_batch_legal_mask,
+    "batch_play" : tictactoe_batch_play,
+}
@@ -1,5 +1,4 @@
 import numpy as np
-from tabulate import tabulate
 from board_game_rl.board_classes import Player, GameBoard
 
 def tictactoe_play_logic(board, player: Player, move: tuple, mutate=True):
@@ -64,6 +63,21 @@ def tictactoe_board_valid_moves(board, player=None) -> list[tuple[int, int]]:
     """
     return [(i, j) for i in range(3) for j in range(3) if board[i, j] == Player.none.value]
 
+def tictactoe_legal_mask(board, out, player=None) -> np.ndarray:
+    """
+    The logic of finding the legal moves in TicTacToe as a boolean mask over the flat cell indices
+    (action = 3*row + column). The mask is written into the preallocated array out.
+
+    Args:
+    board: np.ndarray
+    out: np.ndarray of shape (9,) and dtype bool
+    player: Player
+
+    Returns:
+    np.ndarray
+    """
+    return np.equal(board.reshape(9), Player.none.value, out=out)
+
 def tictactoe_render(board):
     """
     The logic of rendering the TicTacToe board. The function takes a board and prints the board.
@@ -82,6 +96,8 @@ def tictactoe_render(board):
     >>> tictactoe_render(board)
     ```
     """
+    # Imported here so that headless workers never load tabulate.
+    from tabulate import tabulate
     rendered_board = np.zeros((3, 3), dtype=str)
     for ii in range(3):
         for jj in range(3):
@@ -130,11 +146,83 @@ def tictactoe_winner(board) -> Player:
     else:
         return Player.none
 
+########################### Batched Logic ###########################
+
+# Flat cell indices of the eight winning lines (rows, columns, diagonals).
+TICTACTOE_LINES = np.array([
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],
+    [0, 4, 8], [2, 4, 6],
+])
+
+def tictactoe_batch_winner(boards) -> np.ndarray:
+    """
+    The logic of finding the winners of a batch of TicTacToe boards at once. The function takes a stack of
+    boards and returns the value of the winning player of each board.
+
+    Args:
+    boards: np.ndarray of shape (N, 3, 3)
+
+    Returns:
+    np.ndarray of shape (N,) holding Player.A.value, Player.B.value or Player.none.value
+
+    Example:
+    ```python
+    >>> from tictactoe_logic import tictactoe_batch_winner
+    >>> import numpy as np
+    >>> boards = np.zeros((2, 3, 3))
+    >>> boards[1, 0, :] = 1.0
+    >>> tictactoe_batch_winner(boards)
+    array([0., 1.])
+    ```
+    """
+    boards = np.asarray(boards)
+    line_sums = boards.reshape(len(boards), 9)[:, TICTACTOE_LINES].sum(axis=2)
+    winners = np.full(len(boards), Player.none.value)
+    winners[(line_sums == 3*Player.B.value).any(axis=1)] = Player.B.value
+    winners[(line_sums == 3*Player.A.value).any(axis=1)] = Player.A.value
+    return winners
+
+def tictactoe_batch_legal_mask(boards) -> np.ndarray:
+    """
+    The logic of finding the legal moves of a batch of TicTacToe boards at once. The function takes a stack of
+    boards and returns a boolean mask over the flat cell indices (action = 3*row + column) of each board.
+
+    Args:
+    boards: np.ndarray of shape (N, 3, 3)
+
+    Returns:
+    np.ndarray of shape (N, 9) and dtype bool
+    """
+    boards = np.asarray(boards)
+    return boards.reshape(len(boards), 9) == Player.none.value
+
+def tictactoe_batch_play(boards, players, actions) -> np.ndarray:
+    """
+    The logic of playing one move on each board of a batch of TicTacToe boards. The boards are mutated in
+    place. The moves are assumed to be legal, see tictactoe_batch_legal_mask.
+
+    Args:
+    boards: np.ndarray of shape (N, 3, 3)
+    players: np.ndarray of shape (N,) holding the value of the player moving on each board
+    actions: np.ndarray of shape (N,) holding flat cell indices
+
+    Returns:
+    np.ndarray
+    """
+    rows, cols = np.divmod(np.asarray(actions), 3)
+    boards[np.arange(len(boards)), rows, cols] = players
+    return boards
+
 # Each value is a function expressing the logic of TicTacToe.
 tictactoe_logic = {
     "valid_moves" : tictactoe_board_valid_moves,
+    "legal_mask" : tictactoe_legal_mask,
     "play" : tictactoe_play_logic,
     "board" : np.zeros((3, 3)),
     "render" : tictactoe_render,
     "winner" : tictactoe_winner,
+    "batch_winner" : tictactoe_batch_winner,
+    "batch_legal_mask" : tictactoe_batch_legal_mask,
+    "batch_play" : tictactoe_batch_play,
 }
@@ -0,0 +1,285 @@
+import time
+import numpy as np
+from board_game_rl.board_classes import Player, GameBoard
+from board_game_rl.rollout import RolloutEvaluator
+
+# Player enum members by value, for the player values stored in the node arrays.
+PLAYERS = {Player.A.value: Player.A, Player.B.value: Player.B}
+
+# The per-node arrays of the search tree.
+NODE_ARRAYS = {
+    "visits" : np.int64,
+    "value_sums" : np.float64,
+    "priors" : np.float32,
+    "actions" : np.int64,
+    "players" : np.float64,
+    "first_child" : np.int64,
+    "num_children" : np.int64,
+    "terminal_values" : np.float64,
+}
+
+class RolloutPriorEvaluator:
+    """
+    The default MCTS leaf evaluator: uniform priors over the legal actions and values from batched
+    random rollouts (see rollout.RolloutEvaluator).
+
+    An evaluator is called as evaluator(boards, players, masks) with a batch of leaf positions of
+    shape (B, rows, cols), the values of the players to move (B,) and the legal-action masks
+    (B, num_actions). It returns the priors (B, num_actions) and the values (B,) in [-1, 1] for the
+    player to move.
+
+    Args:
+    logic: dict[str, callable]
+    num_rollouts: int
+    seed: int or None
+    """
+    def __init__(self, logic, num_rollouts=32, seed=None):
+        self.rollouts = RolloutEvaluator(logic, num_rollouts=num_rollouts, seed=seed)
+
+    def __call__(self, boards, players, masks) -> tuple[np.ndarray, np.ndarray]:
+        priors = masks / masks.sum(axis=1, keepdims=True)
+        return priors, self.rollouts.evaluate_batch(boards, players)
+
+class MCTSPolicy:
+    """
+    A Monte Carlo tree search (PUCT) policy, usable with Agent like random_policy.
+
+    The tree is stored in flat NumPy arrays (visit counts, value sums, priors, ...) indexed by node,
+    with the children of a node in one contiguous block, instead of one Python object per node. The
+    search walks a single GameBoard with push/pop, so no board is copied per node. Leaves are
+    collected with virtual loss and sent to the evaluator in batches of batch_size. After a move the
+    subtree under the position reached is kept and reused by the next call.
+
+    A search stops after num_simulations simulations or time_budget seconds, whichever comes first
+    (either may be None, but not both).
+
+    Args:
+    logic: dict[str, callable]
+    evaluator: callable or None, see RolloutPriorEvaluator for the protocol
+    num_simulations: int or None
+    time_budget: float or None
+    batch_size: int
+    c_puct: float
+    reuse_tree: bool
+    initial_capacity: int
+
+    Example:
+    ```python
+    >>> from board_game_rl import Agent, Player, tictactoe_logic
+    >>> from board_game_rl.example_policies.mcts_policy import MCTSPolicy
+    >>> agentA = Agent(Player.A, MCTSPolicy(tictactoe_logic, num_simulations=400))
+    >>> agentB = Agent(Player.B, MCTSPolicy(tictactoe_logic, time_budget=0.05))
+    ```
+    """
+    def __init__(self, logic, evaluator=None, num_simulations=800, time_budget=None, batch_size=8,
+                 c_puct=1.5, reuse_tree=True, initial_capacity=4096):
+        if num_simulations is None and time_budget is None:
+            raise ValueError("Set num_simulations, time_budget or both.")
+        self.logic = logic
+        self.evaluator = evaluator if evaluator is not None else RolloutPriorEvaluator(logic)
+        self.num_simulations = num_simulations
+        self.time_budget = time_budget
+        self.batch_size = batch_size
+        self.c_puct = c_puct
+        self.reuse_tree = reuse_tree
+        self.game_board = GameBoard(logic)
+        self.game_board.reset()
+        self.board_shape = np.shape(np.asarray(self.game_board.board))
+        self._allocate(initial_capacity)
+        self._root = None
+        self._root_board = None
+        self.last_simulations = 0
+
+    ########################### Node Storage ###########################
+
+    def _allocate(self, capacity) -> None:
+        for name, dtype in NODE_ARRAYS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.num_nodes = 0
+
+    def _new_nodes(self, count) -> int:
+        start = self.num_nodes
+        if start + count > len(self.visits):
+            capacity = max(2*len(self.visits), start + count)
+            for name in NODE_ARRAYS:
+                array = getattr(self, name)
+                grown = np.zeros(capacity, dtype=array.dtype)
+                grown[:start] = array[:start]
+                setattr(self, name, grown)
+        end = start + count
+        self.visits[start:end] = 0
+        self.value_sums[start:end] = 0.0
+        self.first_child[start:end] = -1
+        self.num_children[start:end] = 0
+        self.terminal_values[start:end] = np.nan
+        self.num_nodes = end
+        return start
+
+    def _compact(self, root) -> int:
+        # Keep only the subtree under root, renumbered breadth first so sibling blocks stay contiguous.
+        levels = [np.array([root])]
+        while True:
+            frontier = levels[-1]
+            expanded = frontier[self.first_child[frontier] >= 0]
+            if len(expanded) == 0:
+                break
+            counts = self.num_children[expanded]
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            levels.append(np.repeat(self.first_child[expanded], counts) + offsets)
+        order = np.concatenate(levels)
+        remap = np.full(self.num_nodes, -1, dtype=np.int64)
+        remap[order] = np.arange(len(order))
+        for name in NODE_ARRAYS:
+            array = getattr(self, name)
+            array[:len(order)] = array[order]
+        first_child = self.first_child[:len(order)]
+        has_children = first_child >= 0
+        first_child[has_children] = remap[first_child[has_children]]
+        self.num_nodes = len(order)
+        return 0
+
+    def _find_root(self, player) -> int:
+        # Reuse the subtree of the current position if it was reached from the last search.
+        if self.reuse_tree and self._root is not None:
+            current = np.asarray(self.game_board.board)
+            node, root_board = self._root, self._root_board
+            if self.players[node] == player.value and np.array_equal(np.asarray(root_board), current):
+                return self._compact(node)
+            if self.first_child[node] >= 0:
+                mover = PLAYERS[self.players[node]]
+                for child in range(self.first_child[node], self.first_child[node] + self.num_children[node]):
+                    move = self.game_board.action_to_move(self.actions[child])
+                    played = self.logic["play"](root_board.copy(), mover, move, mutate=False)
+                    if played is not None and self.players[child] == player.value and np.array_equal(np.asarray(played), current):
+                        return self._compact(child)
+        self.num_nodes = 0
+        root = self._new_nodes(1)
+        self.actions[root] = -1
+        self.players[root] = player.value
+        self.priors[root] = 1.0
+        return root
+
+    ########################### Search ###########################
+
+    def _select_child(self, node) -> int:
+        start = self.first_child[node]
+        children = slice(start, start + self.num_children[node])
+        visits = self.visits[children]
+        q = self.value_sums[children] / np.maximum(visits, 1)
+        u = self.c_puct * self.priors[children] * np.sqrt(max(self.visits[node], 1)) / (1 + visits)
+        return start + int(np.argmax(q + u))
+
+    def _backup(self, path, outcome) -> None:
+        # outcome is the result from Player.A's point of view; each node stores the value for the
+        # player who moved into it, i.e. the opponent of its player to move.
+        path = np.asarray(path)
+        self.visits[path] += 1
+        self.value_sums[path] -= outcome * self.players[path]
+
+    def _simulate_batch(self, root) -> int:
+        game_board = self.game_board
+        pending, paths = [], []
+        simulations = 0
+        for _ in range(self.batch_size):
+            # Descend to a leaf, applying virtual loss along the way.
+            node, path = root, [root]
+            while self.first_child[node] >= 0:
+                child = self._select_child(node)
+                game_board.push_action(PLAYERS[self.players[node]], self.actions[child])
+                node = child
+                path.append(node)
+            self.visits[path] += 1
+            self.value_sums[path] -= 1.0
+
+            if np.isnan(self.terminal_values[node]) and game_board.game_over():
+                self.terminal_values[node] = game_board.winner().value
+
+            if not np.isnan(self.terminal_values[node]):
+                self.visits[path] -= 1
+                self.value_sums[path] += 1.0
+                self._backup(path, self.terminal_values[node])
+                simulations += 1
+            elif node in pending:
+                # The batch already waits on this leaf; stop collecting.
+                self.visits[path] -= 1
+                self.value_sums[path] += 1.0
+                for _ in range(len(path) - 1):
+                    game_board.pop()
+                break
+            else:
+                player = PLAYERS[self.players[node]]
+                pending.append(node)
+                paths.append((path, np.array(game_board.board, dtype=float), game_board.legal_mask(player).copy()))
+            for _ in range(len(path) - 1):
+                game_board.pop()
+
+        if pending:
+            boards = np.stack([board for _, board, _ in paths])
+            masks = np.stack([mask for _, _, mask in paths])
+            players = self.players[pending]
+            priors, values = self.evaluator(boards, players, masks)
+            for i, node in enumerate(pending):
+                path = paths[i][0]
+                self.visits[path] -= 1
+                self.value_sums[path] += 1.0
+
+                # Expand the leaf with one child per legal action.
+                legal = np.flatnonzero(masks[i])
+                start = self._new_nodes(len(legal))
+                children = slice(start, start + len(legal))
+                self.actions[children] = legal
+                self.players[children] = -players[i]
+                leaf_priors = priors[i][legal]
+                total = leaf_priors.sum()
+                self.priors[children] = leaf_priors / total if total > 0 else 1.0 / len(legal)
+                self.first_child[node] = start
+                self.num_children[node] = len(legal)
+
+                self._backup(path, values[i] * players[i])
+        return simulations + len(pending)
+
+    def search(self, board, player: Player) -> np.ndarray:
+        """
+        Run a search from a position and return the visit counts of the root's actions.
+
+        Args:
+        board: GameBoard or a board in the format of the logic
+        player: Player, the player to move
+
+        Returns:
+        np.ndarray of shape (num_actions,)
+        """
+        self.game_board.set_board(board)
+        root = self._find_root(player)
+        self._search_root = root
+        start_time = time.perf_counter()
+        simulations = 0
+        while True:
+            if self.num_simulations is not None and simulations >= self.num_simulations:
+                break
+            if self.time_budget is not None and time.perf_counter() - start_time >= self.time_budget:
+                break
+            simulations += max(self._simulate_batch(root), 1)
+        self.last_simulations = simulations
+
+        counts = np.zeros(self.game_board.num_actions, dtype=np.int64)
+        if self.first_child[root] >= 0:
+            children = slice(self.first_child[root], self.first_child[root] + self.num_children[root])
+            counts[self.actions[children]] = self.visits[children]
+        return counts
+
+    def __call__(self, board: GameBoard, player: Player) -> tuple:
+        counts = self.search(board, player)
+        action = int(np.argmax(counts))
+
+        # Remember the position after the chosen move, to reuse its subtree on the next call.
+        root = self._search_root
+        if self.first_child[root] >= 0:
+            children = range(self.first_child[root], self.first_child[root] + self.num_children[root])
+            self._root = next(child for child in children if self.actions[child] == action)
+            self.game_board.push_action(player, action)
+            self._root_board = self.game_board.board.copy()
+            self.game_board.pop()
+        else:
+            self._root = None
+        return self.game_board.action_to_move(action)
@@ -0,0 +1,74 @@
+import os
+from board_game_rl.board_classes import Player, GameBoard
+from board_game_rl.solver import Solver
+from board_game_rl.example_logic.tictactoe_logic import tictactoe_logic
+
+# Where the solved TicTacToe table is kept between processes.
+TICTACTOE_TABLE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "board_game_rl", "tictactoe_solved.npz")
+
+def load_or_solve(logic: dict, path=None) -> Solver:
+    """
+    Load a solved table from path, or solve every reachable position of the game and save the table
+    to path so later processes can load it instead of solving again.
+
+    Args:
+    logic: dict[str, callable]
+    path: str or None
+
+    Returns:
+    Solver
+    """
+    if path is not None and os.path.exists(path):
+        return Solver.load(logic, path)
+    solver = Solver(logic)
+    solver.solve_all()
+    if path is not None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        solver.save(path)
+    return solver
+
+def make_perfect_policy(logic: dict, path=None) -> callable:
+    """
+    Build a perfect-play policy for a game. The game is solved (or its table loaded from path) on the
+    first call, after which moves are read from the solved table.
+
+    Args:
+    logic: dict[str, callable]
+    path: str or None
+
+    Returns:
+    callable
+    """
+    solver = None
+
+    def perfect_policy(board: GameBoard, player: Player) -> tuple:
+        nonlocal solver
+        if solver is None:
+            solver = load_or_solve(logic, path)
+        return solver.best_move(board, player)
+
+    return perfect_policy
+
+def perfect_policy(board: GameBoard, player: Player) -> tuple[int, int]:
+    """
+    A perfect-play TicTacToe policy that takes a board and a player and returns a best move. The solved
+    table is cached in TICTACTOE_TABLE_PATH.
+
+    Args:
+    board: GameBoard
+    player: Player
+
+    Returns:
+    tuple[int, int]
+
+    Example:
+    ```python
+    >>> from policies import perfect_policy
+    >>> from board_classes import Agent, Player
+    >>> agentA = Agent(Player.A, perfect_policy)
+    >>> move = agentA(board)
+    ```
+    """
+    return _tictactoe_perfect_policy(board, player)
+
+_tictactoe_perfect_policy = make_perfect_policy(tictactoe_logic, TICTACTOE_TABLE_PATH)
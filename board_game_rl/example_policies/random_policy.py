@@ -4,10 +4,11 @@ import numpy as np
 
 def random_policy(board: GameBoard, player: Player) -> tuple[int, int]:
     """
-    A random policy that takes a board and a player and returns a random move.
+    A random policy that takes a board and a player and returns a random move. The move is sampled
+    from the board's legal-action mask, so no list of moves is built.
 
     Args:
-    board: np.ndarray
+    board: GameBoard
     player: Player
 
     Returns:
@@ -16,12 +17,13 @@ def random_policy(board: GameBoard, player: Player) -> tuple[int, int]:
     Example:
     ```python
     >>> from policies import random_policy
-    >>> from board_classes import Player
-    >>> import numpy as np
-    >>> board = np.zeros((3, 3))
+    >>> from board_classes import GameBoard, Player
+    >>> from tictactoe_logic import tictactoe_logic
+    >>> board = GameBoard(tictactoe_logic)
+    >>> board.reset()
     >>> random_policy(board, Player.A)
     (1, 2)
     ```
     """
-    valid_moves = board.valid_moves(player=player)
-    return random.choice(valid_moves)
+    actions = np.flatnonzero(board.legal_mask(player=player))
+    return board.action_to_move(actions[random.randrange(len(actions))])
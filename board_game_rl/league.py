@@ -0,0 +1,333 @@
+import contextlib
+import itertools
+import math
+import statistics
+import numpy as np
+from .board_classes import Agent, GameBoard, Player
+from .board_playing import play_game
+from .tournament import global_random_state, seed_worker, set_global_random_state
+
+# Elo points per natural log-odds unit.
+ELO_SCALE = 400 / math.log(10)
+
+def elo_to_score(elo: float) -> float:
+    """
+    The expected score (win 1, draw 1/2, loss 0) of a player rated elo points above its opponent.
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+def score_to_elo(score: float) -> float:
+    """
+    The Elo difference that gives an expected score, the inverse of elo_to_score.
+    """
+    score = min(max(score, 1e-9), 1 - 1e-9)
+    return -400 * math.log10(1 / score - 1)
+
+class SPRT:
+    """
+    A sequential probability ratio test of H0: "the Elo difference is elo0" against H1: "the Elo
+    difference is elo1", from game results of the tested player. The log-likelihood ratio uses the
+    normal approximation of the mean score with its observed variance, which handles draws. The
+    results start with prior virtual wins and as many virtual losses, which keeps the variance above
+    zero, so a run of identical results (every game won, or every game drawn) still reaches a bound.
+
+    The test accepts H1 when the log-likelihood ratio reaches log((1 - beta) / alpha) and H0 when it
+    falls to log(beta / (1 - alpha)), so the false positive rate is at most alpha and the false
+    negative rate at most beta, usually after far fewer games than a fixed-length match needs.
+
+    Args:
+    elo0: float
+    elo1: float
+    alpha: float
+    beta: float
+    prior: float
+
+    Example:
+    ```python
+    >>> from league import SPRT
+    >>> sprt = SPRT(elo0=0, elo1=50)
+    >>> sprt.add(wins=60, draws=10, losses=30)
+    >>> sprt.decision()
+    'H1'
+    ```
+    """
+    def __init__(self, elo0=0.0, elo1=20.0, alpha=0.05, beta=0.05, prior=1.0):
+        self.score0 = elo_to_score(elo0)
+        self.score1 = elo_to_score(elo1)
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.prior = prior
+        self.wins = self.draws = self.losses = 0
+
+    def add(self, wins=0, draws=0, losses=0) -> None:
+        self.wins += wins
+        self.draws += draws
+        self.losses += losses
+
+    @property
+    def num_games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def llr(self) -> float:
+        """
+        The log-likelihood ratio of H1 against H0 of the games so far.
+        """
+        if self.num_games == 0:
+            return 0.0
+        wins, losses = self.wins + self.prior, self.losses + self.prior
+        n = wins + self.draws + losses
+        mean = (wins + 0.5*self.draws) / n
+        variance = (wins + 0.25*self.draws) / n - mean**2
+        if variance <= 0:
+            return 0.0
+        return n * (self.score1 - self.score0) * (2*mean - self.score0 - self.score1) / (2*variance)
+
+    def decision(self):
+        """
+        "H1" or "H0" once the test has decided, None while more games are needed.
+        """
+        llr = self.llr()
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+class PairingResult:
+    """
+    The games of one pairing of a League, from the point of view of the first agent.
+
+    Attributes:
+    name_a: str
+    name_b: str
+    wins: int, the games won by name_a
+    draws: int
+    losses: int, the games won by name_b
+    llr: float, the final log-likelihood ratio of the SPRT
+    decision: str or None, "H1" if name_a is stronger by elo1, "H0" if it is not, None if the
+        pairing stopped at max_games first
+    """
+    def __init__(self, name_a, name_b, sprt: SPRT):
+        self.name_a = name_a
+        self.name_b = name_b
+        self.wins = sprt.wins
+        self.draws = sprt.draws
+        self.losses = sprt.losses
+        self.llr = sprt.llr()
+        self.decision = sprt.decision()
+
+    @property
+    def num_games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def __repr__(self) -> str:
+        return (
+            f"PairingResult({self.name_a} vs {self.name_b}: wins={self.wins}, draws={self.draws}, "
+            f"losses={self.losses}, llr={self.llr:.2f}, decision={self.decision})"
+        )
+
+class League:
+    """
+    An evaluation league between named agents. Each pairing is played in pairs of games with the
+    colours swapped (each agent plays once as Player.A, moving first, and once as Player.B) and stops
+    as soon as its SPRT decides, or after max_games. Elo ratings with confidence intervals are fitted
+    to all games played so far.
+
+    Args:
+    logic: dict[str, callable]
+    agents: dict[str, callable], the policy (or Agent, whose policy is used) of each agent
+    elo0: float, see SPRT
+    elo1: float, see SPRT
+    alpha: float, see SPRT
+    beta: float, see SPRT
+    max_games: int, the most games of one pairing
+    seed: int or None, seeds the global random generators used by the policies while the league
+        plays; the caller's generator state is left untouched
+
+    Methods:
+    play_pairing(self, name_a, name_b) -> PairingResult
+    round_robin(self) -> list[PairingResult]
+    ratings(self, anchor, confidence) -> dict
+    table(self) -> str
+
+    Example:
+    ```python
+    >>> from board_game_rl import tictactoe_logic, random_policy, perfect_policy
+    >>> from board_game_rl.league import League
+    >>> league = League(tictactoe_logic, {"random": random_policy, "perfect": perfect_policy}, seed=0)
+    >>> league.play_pairing("perfect", "random")
+    PairingResult(perfect vs random: wins=15, draws=1, losses=0, llr=3.33, decision=H1)
+    >>> print(league.table())
+    ```
+    """
+    def __init__(self, logic, agents, elo0=0.0, elo1=20.0, alpha=0.05, beta=0.05, max_games=2000, seed=None):
+        self.board = GameBoard(logic)
+        self.policies = {
+            name: agent.policy if isinstance(agent, Agent) else agent for name, agent in agents.items()
+        }
+        self.sprt_args = (elo0, elo1, alpha, beta)
+        self.max_games = max_games
+        # results[(x, y)] counts the wins, draws and losses of x against y.
+        self.results = {}
+        # The policies draw from the global generators, so a seeded league keeps its own state of
+        # them and swaps it in only while its games are played.
+        self._random_state = None
+        if seed is not None:
+            caller_state = global_random_state()
+            seed_worker(np.random.SeedSequence(seed))
+            self._random_state = global_random_state()
+            set_global_random_state(caller_state)
+
+    @contextlib.contextmanager
+    def _seeded(self):
+        if self._random_state is None:
+            yield
+            return
+        caller_state = global_random_state()
+        set_global_random_state(self._random_state)
+        try:
+            yield
+        finally:
+            self._random_state = global_random_state()
+            set_global_random_state(caller_state)
+
+    ########################### Matches ###########################
+
+    def _play(self, name_x, name_y, x_first: bool) -> float:
+        # The score of x in one game.
+        if x_first:
+            agentA, agentB = Agent(Player.A, self.policies[name_x]), Agent(Player.B, self.policies[name_y])
+        else:
+            agentA, agentB = Agent(Player.A, self.policies[name_y]), Agent(Player.B, self.policies[name_x])
+        winner, _ = play_game(self.board, agentA, agentB)
+        if winner == Player.none:
+            return 0.5
+        return 1.0 if (winner == Player.A) == x_first else 0.0
+
+    def _record(self, name_x, name_y, wins, draws, losses) -> None:
+        for key, counts in (((name_x, name_y), (wins, draws, losses)), ((name_y, name_x), (losses, draws, wins))):
+            total = self.results.setdefault(key, [0, 0, 0])
+            for index, count in enumerate(counts):
+                total[index] += count
+
+    def play_pairing(self, name_a: str, name_b: str) -> PairingResult:
+        """
+        Play pairs of games between two agents until the SPRT of name_a against name_b decides or
+        max_games are played.
+
+        Args:
+        name_a: str
+        name_b: str
+
+        Returns:
+        PairingResult
+        """
+        sprt = SPRT(*self.sprt_args)
+        with self._seeded():
+            while sprt.num_games + 2 <= self.max_games and sprt.decision() is None:
+                scores = (self._play(name_a, name_b, True), self._play(name_a, name_b, False))
+                wins, draws = scores.count(1.0), scores.count(0.5)
+                sprt.add(wins, draws, 2 - wins - draws)
+        self._record(name_a, name_b, sprt.wins, sprt.draws, sprt.losses)
+        return PairingResult(name_a, name_b, sprt)
+
+    def round_robin(self) -> list[PairingResult]:
+        """
+        Play one pairing between every two agents.
+        """
+        return [self.play_pairing(name_a, name_b) for name_a, name_b in itertools.combinations(self.policies, 2)]
+
+    ########################### Ratings ###########################
+
+    def ratings(self, anchor=None, confidence=0.95, prior_draws=1.0) -> dict:
+        """
+        Fit Elo ratings to every game played so far by maximum likelihood (Bradley-Terry, a draw
+        counting as half a win), with normal confidence intervals from the Fisher information.
+
+        Ratings are relative to anchor (by default the first agent), which is fixed at 0. Every
+        pairing that has been played gets prior_draws virtual draws, which keeps ratings finite when
+        one agent has won every game. Agents that are not connected to the anchor through played
+        pairings get infinite intervals; their ratings are only relative to each other.
+
+        Args:
+        anchor: str or None
+        confidence: float
+        prior_draws: float
+
+        Returns:
+        dict: {name: (elo, lower, upper)}
+        """
+        names = list(self.policies)
+        index = {name: i for i, name in enumerate(names)}
+        anchor = index[anchor if anchor is not None else names[0]]
+        size = len(names)
+        games = np.zeros((size, size))
+        scores = np.zeros((size, size))
+        for (name_x, name_y), (wins, draws, losses) in self.results.items():
+            x, y = index[name_x], index[name_y]
+            games[x, y] = wins + draws + losses + prior_draws
+            scores[x, y] = wins + 0.5*(draws + prior_draws)
+
+        # Each group of agents connected by played pairings is fitted with one of its agents fixed at
+        # 0: the anchor in its own group, the first agent in the others.
+        component = np.full(size, -1)
+        for start in range(size):
+            if component[start] < 0:
+                component[start] = start
+                stack = [start]
+                while stack:
+                    for y in np.flatnonzero(games[stack.pop()] > 0):
+                        if component[y] < 0:
+                            component[y] = start
+                            stack.append(y)
+        fixed = np.zeros(size, dtype=bool)
+        fixed[[np.flatnonzero(component == c)[0] for c in np.unique(component) if c != component[anchor]]] = True
+        fixed[anchor] = True
+        free = ~fixed
+
+        ratings = np.zeros(size)
+        hessian = np.zeros((size, size))
+        for _ in range(100):
+            if not free.any():
+                break
+            expected = 1 / (1 + np.exp(ratings[np.newaxis] - ratings[:, np.newaxis]))
+            gradient = (scores - games*expected).sum(axis=1)
+            weights = games*expected*(1 - expected)
+            hessian = weights - np.diag(weights.sum(axis=1))
+            step = np.zeros(size)
+            step[free] = np.linalg.solve(hessian[np.ix_(free, free)], -gradient[free])
+            ratings += step
+            if np.abs(step).max() < 1e-10:
+                break
+
+        # The standard errors, from the inverse of the observed information. Agents that are not
+        # connected to the anchor have no rating relative to it, so their intervals are infinite.
+        errors = np.zeros(size)
+        if free.any():
+            covariance = np.linalg.inv(-hessian[np.ix_(free, free)])
+            errors[free] = np.sqrt(np.diag(covariance))
+        errors[component != component[anchor]] = np.inf
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence/2)
+        return {
+            name: (
+                float(ELO_SCALE*ratings[i]),
+                float(ELO_SCALE*(ratings[i] - z*errors[i])),
+                float(ELO_SCALE*(ratings[i] + z*errors[i])),
+            )
+            for i, name in enumerate(names)
+        }
+
+    def table(self, anchor=None) -> str:
+        """
+        The ratings and game counts as a table, strongest agent first.
+        """
+        from tabulate import tabulate
+        ratings = self.ratings(anchor)
+        games = {name: 0 for name in self.policies}
+        for (name_x, _), counts in self.results.items():
+            games[name_x] += sum(counts)
+        rows = sorted(
+            ([name, elo, lower, upper, games[name]] for name, (elo, lower, upper) in ratings.items()),
+            key=lambda row: -row[1],
+        )
+        return tabulate(rows, headers=["agent", "elo", "lower", "upper", "games"], floatfmt=".1f")
@@ -0,0 +1,365 @@
+import asyncio
+import struct
+import time
+import numpy as np
+from .board_classes import GameBoard, Player
+from .env_class import GameEnv
+
+# Every message is a frame: a 2-byte big-endian payload length followed by the payload, whose first
+# byte is the message type.
+#
+#   HELLO    agent -> server  type, name (utf-8)
+#   WELCOME  server -> agent  type, seat (player value), rows, cols, num_actions
+#   REQUEST  server -> agent  type, game id, player value, cells (rows*cols int8), legal mask (packed bits)
+#   MOVE     agent -> server  type, game id, action
+#   RESULT   server -> agent  type, game id, winner value, end reason
+#   SHUTDOWN server -> agent  type
+HELLO, WELCOME, REQUEST, MOVE, RESULT, SHUTDOWN = range(6)
+
+FRAME_HEADER = struct.Struct("!H")
+WELCOME_MESSAGE = struct.Struct("!BbBBH")
+REQUEST_HEADER = struct.Struct("!BIb")
+MOVE_MESSAGE = struct.Struct("!BIH")
+RESULT_MESSAGE = struct.Struct("!BIbB")
+
+# How a game ended.
+END_REASONS = ("finished", "timeout", "illegal", "disconnected")
+FINISHED, TIMEOUT, ILLEGAL, DISCONNECTED = range(4)
+
+def _frame(payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    (length,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    return await reader.readexactly(length)
+
+def _expire(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_exception(asyncio.TimeoutError())
+
+class GameReport:
+    """
+    The outcome and timing of one game played by a MatchServer.
+
+    Attributes:
+    game_id: int
+    winner: Player, Player.none for a draw
+    num_moves: int
+    reason: str, one of END_REASONS; for anything but "finished" the winner is the opponent of
+        forfeited
+    forfeited: Player or None, the player who lost by timeout, illegal move or disconnection
+    duration: float, the wall time of the game in seconds
+    move_latencies: np.ndarray, the seconds between each move request and its answer
+    """
+    def __init__(self, game_id, winner, num_moves, reason, forfeited, duration, move_latencies):
+        self.game_id = game_id
+        self.winner = winner
+        self.num_moves = num_moves
+        self.reason = reason
+        self.forfeited = forfeited
+        self.duration = duration
+        self.move_latencies = np.asarray(move_latencies)
+
+    @property
+    def mean_latency(self) -> float:
+        return float(self.move_latencies.mean()) if len(self.move_latencies) else 0.0
+
+    @property
+    def max_latency(self) -> float:
+        return float(self.move_latencies.max()) if len(self.move_latencies) else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"GameReport(game_id={self.game_id}, winner={self.winner}, num_moves={self.num_moves}, "
+            f"reason={self.reason!r}, duration={self.duration:.4f}, mean_latency={self.mean_latency:.6f})"
+        )
+
+def summarize_reports(reports: list[GameReport], elapsed: float = None) -> dict:
+    """
+    Aggregate the reports of a batch of games: results, end reasons and latency percentiles in
+    milliseconds. If elapsed (the wall time of the whole batch) is given, games_per_sec and
+    moves_per_sec are included.
+
+    Args:
+    reports: list[GameReport]
+    elapsed: float or None
+
+    Returns:
+    dict
+    """
+    latencies = np.concatenate([report.move_latencies for report in reports]) if reports else np.empty(0)
+    durations = np.array([report.duration for report in reports])
+    num_moves = sum(report.num_moves for report in reports)
+    summary = {
+        "games" : len(reports),
+        "moves" : num_moves,
+        "wins" : sum(report.winner == Player.A for report in reports),
+        "draws" : sum(report.winner == Player.none for report in reports),
+        "losses" : sum(report.winner == Player.B for report in reports),
+    }
+    for reason in END_REASONS:
+        summary[reason] = sum(report.reason == reason for report in reports)
+    if len(latencies):
+        p50, p99 = np.percentile(latencies, [50, 99])
+        summary.update({
+            "move_latency_mean_ms" : 1e3*float(latencies.mean()),
+            "move_latency_p50_ms" : 1e3*float(p50),
+            "move_latency_p99_ms" : 1e3*float(p99),
+            "move_latency_max_ms" : 1e3*float(latencies.max()),
+            "game_duration_mean_ms" : 1e3*float(durations.mean()),
+        })
+    if elapsed:
+        summary["games_per_sec"] = len(reports) / elapsed
+        summary["moves_per_sec"] = num_moves / elapsed
+    return summary
+
+class AgentConnection:
+    """
+    The server side of one connected agent. Move requests of every game the agent plays are
+    multiplexed over the connection and matched to the answers by game id.
+    """
+    def __init__(self, name, reader, writer):
+        self.name = name
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}
+        self.closed = False
+
+    async def request_move(self, game_id: int, player: Player, cells: bytes, mask: bytes, timeout: float) -> int:
+        """
+        Send a move request and wait at most timeout seconds for the answer. Raises
+        asyncio.TimeoutError if the agent is too slow and ConnectionError if it disconnected.
+        """
+        if self.closed:
+            raise ConnectionError(f"Agent {self.name!r} is disconnected.")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending[game_id] = future
+        self.writer.write(_frame(REQUEST_HEADER.pack(REQUEST, game_id, int(player.value)) + cells + mask))
+        handle = loop.call_later(timeout, _expire, future)
+        try:
+            await self.writer.drain()
+            return await future
+        finally:
+            handle.cancel()
+            self.pending.pop(game_id, None)
+
+    def send(self, payload: bytes) -> None:
+        if not self.closed:
+            self.writer.write(_frame(payload))
+
+    async def read_moves(self) -> None:
+        # Resolve pending requests until the agent disconnects. Answers that arrive after their
+        # timeout have no pending request and are dropped.
+        try:
+            while True:
+                payload = await _read_frame(self.reader)
+                if payload[0] != MOVE:
+                    continue
+                _, game_id, action = MOVE_MESSAGE.unpack(payload)
+                future = self.pending.get(game_id)
+                if future is not None and not future.done():
+                    future.set_result(action)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.closed = True
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Agent {self.name!r} disconnected."))
+
+class MatchServer:
+    """
+    An asyncio server hosting many concurrent games between two remote agents over TCP or Unix
+    sockets. The first agent to connect plays Player.A in every game and the second Player.B.
+
+    Each game runs as a coroutine around its own GameEnv. A move request is sent to the agent to
+    move, which answers with an integer action; the server waits for nothing else, so thousands of
+    games can be in flight and throughput is bounded by how fast the agents answer. An agent that
+    does not answer within move_timeout seconds, answers with an illegal action or disconnects
+    forfeits the game. The timeout runs from when the request is sent, so it includes the time the
+    request waits behind other games at the agent; max_concurrent_games bounds that queue. Every
+    game returns a GameReport with its result and move latencies.
+
+    Args:
+    game_logic: dict[str, callable]
+    move_timeout: float, seconds
+    max_concurrent_games: int or None, the number of games in flight at once (None for all)
+
+    Example:
+    ```python
+    >>> import asyncio
+    >>> from board_game_rl import tictactoe_logic, random_policy
+    >>> from board_game_rl.match_server import MatchServer, run_agent, summarize_reports
+    >>> async def main():
+    ...     server = MatchServer(tictactoe_logic, move_timeout=0.5)
+    ...     await server.start()
+    ...     agents = [asyncio.create_task(run_agent(random_policy, tictactoe_logic, port=server.port)) for _ in range(2)]
+    ...     reports = await server.play_matches(1000)
+    ...     await server.close()
+    ...     await asyncio.gather(*agents)
+    ...     return summarize_reports(reports)
+    >>> asyncio.run(main())
+    ```
+    """
+    def __init__(self, game_logic, move_timeout=1.0, max_concurrent_games=None):
+        self.logic = game_logic
+        self.move_timeout = move_timeout
+        self.max_concurrent_games = max_concurrent_games
+        self.agents = []
+        self.port = None
+        self._server = None
+        self._agents_ready = asyncio.Event()
+        self._readers = []
+        game_board = GameBoard(game_logic)
+        self.board_shape = game_board.board_shape
+        self.num_actions = game_board.num_actions
+
+    ########################### Connections ###########################
+
+    async def start(self, host="127.0.0.1", port=0) -> None:
+        """
+        Listen for agents on a TCP socket. With port 0 a free port is chosen; it is kept in self.port.
+        """
+        self._server = await asyncio.start_server(self._on_connect, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def start_unix(self, path: str) -> None:
+        """
+        Listen for agents on a Unix socket.
+        """
+        self._server = await asyncio.start_unix_server(self._on_connect, path)
+
+    async def _on_connect(self, reader, writer) -> None:
+        payload = await _read_frame(reader)
+        if payload[0] != HELLO or len(self.agents) == 2:
+            writer.close()
+            return
+        player = Player.A if not self.agents else Player.B
+        writer.write(_frame(WELCOME_MESSAGE.pack(WELCOME, int(player.value), *self.board_shape, self.num_actions)))
+        agent = AgentConnection(payload[1:].decode(), reader, writer)
+        self.agents.append(agent)
+        if len(self.agents) == 2:
+            self._agents_ready.set()
+        await agent.read_moves()
+
+    async def close(self) -> None:
+        """
+        Tell the agents to shut down and stop listening.
+        """
+        for agent in self.agents:
+            agent.send(bytes([SHUTDOWN]))
+            agent.writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    ########################### Games ###########################
+
+    async def play_matches(self, num_games: int) -> list[GameReport]:
+        """
+        Wait for both agents and play num_games concurrent games.
+
+        Args:
+        num_games: int
+
+        Returns:
+        list[GameReport], in game id order
+        """
+        await self._agents_ready.wait()
+        if self.max_concurrent_games is None:
+            return list(await asyncio.gather(*(self._play_game(game_id) for game_id in range(num_games))))
+        semaphore = asyncio.Semaphore(self.max_concurrent_games)
+        async def play(game_id):
+            async with semaphore:
+                return await self._play_game(game_id)
+        return list(await asyncio.gather(*(play(game_id) for game_id in range(num_games))))
+
+    async def _play_game(self, game_id: int) -> GameReport:
+        env = GameEnv(self.logic)
+        env.reset()
+        seats = ((Player.A, self.agents[0]), (Player.B, self.agents[1]))
+        latencies = []
+        reason, forfeited = FINISHED, None
+        start = time.perf_counter()
+        turn = 0
+        while not env.done:
+            player, agent = seats[turn]
+            mask = env.legal_mask(player)
+            cells = np.asarray(env.game_board.board, dtype=np.int8).tobytes()
+            requested = time.perf_counter()
+            try:
+                action = await agent.request_move(game_id, player, cells, np.packbits(mask).tobytes(), self.move_timeout)
+            except asyncio.TimeoutError:
+                reason, forfeited = TIMEOUT, player
+                break
+            except ConnectionError:
+                reason, forfeited = DISCONNECTED, player
+                break
+            latencies.append(time.perf_counter() - requested)
+            # The mask is still current: nothing has been played since it was sent.
+            if action >= self.num_actions or not mask[action]:
+                reason, forfeited = ILLEGAL, player
+                break
+            env.step_action(player, action)
+            turn = 1 - turn
+
+        if forfeited is None:
+            winner = env.game_board.winner()
+        else:
+            winner = Player.B if forfeited == Player.A else Player.A
+        for _, agent in seats:
+            agent.send(RESULT_MESSAGE.pack(RESULT, game_id, int(winner.value), reason))
+        return GameReport(
+            game_id, winner, len(latencies), END_REASONS[reason], forfeited, time.perf_counter() - start, latencies,
+        )
+
+########################### Agent Client ###########################
+
+async def run_agent(policy, game_logic, host="127.0.0.1", port=None, path=None, name="agent") -> int:
+    """
+    A local agent for a MatchServer: connect over TCP (host, port) or a Unix socket (path) and
+    answer every move request with policy(board, player) until the server shuts down. The board
+    given to the policy is a GameBoard holding the requested position.
+
+    Args:
+    policy: callable
+    game_logic: dict[str, callable]
+    host: str
+    port: int or None
+    path: str or None
+    name: str
+
+    Returns:
+    int: The number of moves played.
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    writer.write(_frame(bytes([HELLO]) + name.encode()))
+    _, _, rows, cols, num_actions = WELCOME_MESSAGE.unpack(await _read_frame(reader))
+
+    board = GameBoard(game_logic)
+    players = {Player.A.value: Player.A, Player.B.value: Player.B}
+    num_cells = rows*cols
+    num_moves = 0
+    try:
+        while True:
+            payload = await _read_frame(reader)
+            if payload[0] == SHUTDOWN:
+                break
+            if payload[0] != REQUEST:
+                continue
+            _, game_id, player_value = REQUEST_HEADER.unpack_from(payload)
+            cells = np.frombuffer(payload, dtype=np.int8, count=num_cells, offset=REQUEST_HEADER.size)
+            board.set_board(cells.reshape(rows, cols).astype(float))
+            move = policy(board, players[player_value])
+            writer.write(_frame(MOVE_MESSAGE.pack(MOVE, game_id, board.move_to_action(move))))
+            await writer.drain()
+            num_moves += 1
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+    return num_moves
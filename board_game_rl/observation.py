@@ -0,0 +1,81 @@
+import numpy as np
+from .board_classes import Player
+from .symmetry import canonical_symmetry, symmetry_permutations
+
+class ObservationEncoder:
+    """
+    An encoder of boards into player-relative planes, written into one preallocated buffer:
+
+    plane 0: the stones of the player to move
+    plane 1: the stones of the opponent
+    plane 2: all ones if the player to move is Player.A, all zeros otherwise
+
+    encode returns a read-only view of the buffer, so learners can use it without copying and cannot
+    mutate the environment through it. The next call to encode overwrites the buffer, so copy the
+    view if it must be kept.
+
+    With canonical=True the board is first mapped to its canonical symmetric image (see
+    symmetry.canonical_symmetry); the symmetry used is kept in self.symmetry and actions can be
+    mapped between the two frames with action_to_canonical and action_from_canonical.
+
+    Args:
+    board_shape: tuple[int, int]
+    canonical: bool
+    dtype: np.dtype
+    symmetries: tuple[np.ndarray, np.ndarray] or None, the (cell_perms, action_perms) of the game
+        (see symmetry.logic_symmetries), by default every symmetry of the board with flat cell
+        actions
+
+    Example:
+    ```python
+    >>> from observation import ObservationEncoder
+    >>> encoder = ObservationEncoder((3, 3))
+    >>> planes = encoder.encode(board, Player.B)
+    >>> planes.shape
+    (3, 3, 3)
+    ```
+    """
+    def __init__(self, board_shape, canonical=False, dtype=np.float32, symmetries=None):
+        self.board_shape = tuple(board_shape)
+        self.canonical = canonical
+        if symmetries is None:
+            perms = symmetry_permutations(self.board_shape)
+            symmetries = (perms, perms)
+        self.cell_perms, self.action_perms = symmetries
+        self.buffer = np.zeros((3,) + self.board_shape, dtype=dtype)
+        self.view = self.buffer.view()
+        self.view.setflags(write=False)
+        self.symmetry = 0
+
+    def encode(self, board, player: Player) -> np.ndarray:
+        """
+        Encode a board from the point of view of player.
+
+        Args:
+        board: np.ndarray or a board with an ndarray view
+        player: Player
+
+        Returns:
+        np.ndarray: A read-only view of shape (3, rows, cols).
+        """
+        cells = np.asarray(board)
+        if self.canonical:
+            _, self.symmetry = canonical_symmetry(cells, self.cell_perms)
+            if self.symmetry:
+                cells = cells.ravel()[self.cell_perms[self.symmetry]].reshape(self.board_shape)
+        np.equal(cells, player.value, out=self.buffer[0], casting="unsafe")
+        np.equal(cells, -player.value, out=self.buffer[1], casting="unsafe")
+        self.buffer[2] = 1 if player.value == Player.A.value else 0
+        return self.view
+
+    def action_to_canonical(self, action: int) -> int:
+        """
+        Map an action on the board to the canonical frame of the last encoded board.
+        """
+        return int(np.flatnonzero(self.action_perms[self.symmetry] == action)[0])
+
+    def action_from_canonical(self, action: int) -> int:
+        """
+        Map an action in the canonical frame of the last encoded board back to the board.
+        """
+        return int(self.action_perms[self.symmetry][action])
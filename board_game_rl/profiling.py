@@ -0,0 +1,187 @@
+import contextlib
+import functools
+import json
+import time
+import numpy as np
+from .board_classes import Agent
+
+def _argument_key(argument):
+    # A hashable stand-in for an argument: players by value, boards by content. Other arrays (such
+    # as the out buffer of legal_mask) are outputs and do not identify the call.
+    if hasattr(argument, "value") and not isinstance(argument, np.ndarray):
+        return argument.value
+    try:
+        hash(argument)
+        return argument
+    except TypeError:
+        return type(argument).__name__
+
+def _board_key(board) -> int:
+    # Policies receive a GameBoard, logic functions the board itself.
+    cells = np.asarray(board.board if hasattr(board, "logic") else board)
+    return hash((cells.shape, cells.tobytes()))
+
+class Profiler:
+    """
+    Opt-in instrumentation of logic-dict callables and agent policies. Each instrumented callable
+    records its number of calls, the duration of every call, and the number of redundant calls, i.e.
+    calls with the same board contents and arguments as the previous call of the same callable.
+
+    Nothing is instrumented by default: profiling only happens through the wrapped logic and
+    policies returned by wrap_logic and wrap_policy (or while a GameBoard is attached with attach),
+    so code that does not use them runs unchanged and pays nothing.
+
+    Methods:
+    wrap(self, name, function) -> callable
+    wrap_logic(self, logic) -> dict
+    wrap_policy(self, policy, name) -> callable
+    wrap_agent(self, agent, name) -> Agent
+    attach(self, board) -> context manager
+    reset(self) -> None
+    summary(self) -> dict
+    report(self) -> str
+    save(self, path) -> None
+
+    Example:
+    ```python
+    >>> from board_game_rl import Agent, GameBoard, Player, tictactoe_logic, random_policy, play_game
+    >>> from board_game_rl.profiling import Profiler
+    >>> profiler = Profiler()
+    >>> board = GameBoard(profiler.wrap_logic(tictactoe_logic))
+    >>> agentA = profiler.wrap_agent(Agent(Player.A, random_policy))
+    >>> agentB = profiler.wrap_agent(Agent(Player.B, random_policy))
+    >>> play_game(board, agentA, agentB)
+    >>> print(profiler.report())
+    ```
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget every recorded call.
+        """
+        self.counts = {}
+        self.timings = {}
+        self.redundant = {}
+        self._last_keys = {}
+
+    def wrap(self, name: str, function: callable) -> callable:
+        """
+        Instrument a callable whose first argument is a board, recording its calls under name.
+
+        Args:
+        name: str
+        function: callable
+
+        Returns:
+        callable
+        """
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if args:
+                key = (_board_key(args[0]),) + tuple(_argument_key(argument) for argument in args[1:])
+                key += tuple((keyword, _argument_key(value)) for keyword, value in sorted(kwargs.items()))
+                if self._last_keys.get(name) == key:
+                    self.redundant[name] = self.redundant.get(name, 0) + 1
+                self._last_keys[name] = key
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            self.timings.setdefault(name, []).append(time.perf_counter() - start)
+            self.counts[name] = self.counts.get(name, 0) + 1
+            return result
+
+        return wrapper
+
+    def wrap_logic(self, logic: dict[str, callable]) -> dict[str, callable]:
+        """
+        A copy of a logic dictionary with every callable instrumented under its key.
+
+        Args:
+        logic: dict[str, callable]
+
+        Returns:
+        dict[str, callable]
+        """
+        return {
+            key: self.wrap(key, value) if callable(value) and not isinstance(value, np.ndarray) else value
+            for key, value in logic.items()
+        }
+
+    def wrap_policy(self, policy: callable, name="policy") -> callable:
+        """
+        Instrument a policy(board, player) under name.
+        """
+        return self.wrap(name, policy)
+
+    def wrap_agent(self, agent: Agent, name=None) -> Agent:
+        """
+        A new Agent for the same player whose policy is instrumented under name (by default
+        "policy[<player>]").
+        """
+        name = name or f"policy[{agent.player}]"
+        return Agent(agent.player, self.wrap_policy(agent.policy, name))
+
+    @contextlib.contextmanager
+    def attach(self, board):
+        """
+        Instrument the logic of an existing GameBoard (or of GameEnv.game_board) for the duration of
+        a with block.
+
+        Example:
+        ```python
+        >>> with profiler.attach(env.game_board):
+        ...     env.step(Player.A, (0, 0))
+        ```
+        """
+        logic = board.logic
+        board.logic = self.wrap_logic(logic)
+        try:
+            yield self
+        finally:
+            board.logic = logic
+
+    ########################### Reports ###########################
+
+    def summary(self) -> dict:
+        """
+        The statistics of every instrumented callable that was called.
+
+        Returns:
+        dict: {name: {"calls", "redundant_calls", "total_s", "mean_us", "p50_us", "p90_us",
+        "p99_us", "max_us"}}
+        """
+        summary = {}
+        for name, timings in self.timings.items():
+            if not timings:
+                continue
+            microseconds = 1e6*np.array(timings)
+            p50, p90, p99 = np.percentile(microseconds, [50, 90, 99])
+            summary[name] = {
+                "calls" : self.counts[name],
+                "redundant_calls" : self.redundant.get(name, 0),
+                "total_s" : float(microseconds.sum()/1e6),
+                "mean_us" : float(microseconds.mean()),
+                "p50_us" : float(p50),
+                "p90_us" : float(p90),
+                "p99_us" : float(p99),
+                "max_us" : float(microseconds.max()),
+            }
+        return summary
+
+    def report(self) -> str:
+        """
+        The summary as a table, sorted by total time.
+        """
+        from tabulate import tabulate
+        summary = sorted(self.summary().items(), key=lambda item: -item[1]["total_s"])
+        headers = ["function", "calls", "redundant", "total s", "mean us", "p50 us", "p90 us", "p99 us", "max us"]
+        rows = [[name] + list(stats.values()) for name, stats in summary]
+        return tabulate(rows, headers=headers, floatfmt=".3g")
+
+    def save(self, path) -> None:
+        """
+        Write the summary to a JSON file.
+        """
+        with open(path, "w") as file:
+            json.dump(self.summary(), file, indent=2)
@@ -0,0 +1,119 @@
+import importlib
+import importlib.metadata
+
+# The entry point groups through which installed packages register their own games and policies,
+# e.g. in pyproject.toml:
+#
+#   [project.entry-points."board_game_rl.games"]
+#   othello = "my_package.othello:othello_logic"
+GAME_ENTRY_POINT_GROUP = "board_game_rl.games"
+POLICY_ENTRY_POINT_GROUP = "board_game_rl.policies"
+
+# Registered objects, or "module:attribute" strings for objects that are imported on first use.
+_games = {
+    "tictactoe" : "board_game_rl.example_logic.tictactoe_logic:tictactoe_logic",
+    "tictactoe_bitboard" : "board_game_rl.example_logic.tictactoe_bitboard_logic:tictactoe_bitboard_logic",
+    "gomoku" : "board_game_rl.example_logic.mnk_logic:gomoku_logic",
+    "connect_four" : "board_game_rl.example_logic.connect_four_logic:connect_four_logic",
+}
+_policies = {
+    "random" : "board_game_rl.example_policies.random_policy:random_policy",
+    "perfect" : "board_game_rl.example_policies.perfect_policy:perfect_policy",
+}
+_loaded_groups = set()
+
+def _load_entry_points(group: str, registry: dict) -> None:
+    # Entry points are only listed (not imported) here, and never override a registered name.
+    if group in _loaded_groups:
+        return
+    _loaded_groups.add(group)
+    entry_points = importlib.metadata.entry_points()
+    # Python < 3.10 returns a dict of groups instead of a selectable collection.
+    if hasattr(entry_points, "select"):
+        entry_points = entry_points.select(group=group)
+    else:
+        entry_points = entry_points.get(group, [])
+    for entry_point in entry_points:
+        registry.setdefault(entry_point.name, entry_point)
+
+def _resolve(name: str, registry: dict, group: str, kind: str):
+    if name not in registry:
+        _load_entry_points(group, registry)
+    if name not in registry:
+        raise KeyError(f"Unknown {kind} {name!r}. Available: {', '.join(sorted(registry))}.")
+    target = registry[name]
+    if isinstance(target, importlib.metadata.EntryPoint):
+        target = target.load()
+    elif isinstance(target, str):
+        module, _, attribute = target.partition(":")
+        target = getattr(importlib.import_module(module), attribute)
+    registry[name] = target
+    return target
+
+def register_game(name: str, logic) -> None:
+    """
+    Register a game logic under name. The logic can be given as a dictionary, or as a
+    "module:attribute" string to import it only when the game is first requested.
+
+    Args:
+    name: str
+    logic: dict[str, callable] or str
+
+    Example:
+    ```python
+    >>> from registry import register_game, get_game
+    >>> register_game("othello", "my_package.othello:othello_logic")
+    >>> board = GameBoard(get_game("othello"))
+    ```
+    """
+    _games[name] = logic
+
+def register_policy(name: str, policy) -> None:
+    """
+    Register a policy under name, as a callable or as a "module:attribute" string.
+
+    Args:
+    name: str
+    policy: callable or str
+    """
+    _policies[name] = policy
+
+def get_game(name: str) -> dict:
+    """
+    The game logic registered under name, importing it on first use. Games of installed packages
+    are found through the "board_game_rl.games" entry point group.
+
+    Args:
+    name: str
+
+    Returns:
+    dict[str, callable]
+    """
+    return _resolve(name, _games, GAME_ENTRY_POINT_GROUP, "game")
+
+def get_policy(name: str) -> callable:
+    """
+    The policy registered under name, importing it on first use. Policies of installed packages
+    are found through the "board_game_rl.policies" entry point group.
+
+    Args:
+    name: str
+
+    Returns:
+    callable
+    """
+    return _resolve(name, _policies, POLICY_ENTRY_POINT_GROUP, "policy")
+
+def available_games() -> list[str]:
+    """
+    The names of every registered game, without importing any of them.
+    """
+    _load_entry_points(GAME_ENTRY_POINT_GROUP, _games)
+    return sorted(_games)
+
+def available_policies() -> list[str]:
+    """
+    The names of every registered policy, without importing any of them.
+    """
+    _load_entry_points(POLICY_ENTRY_POINT_GROUP, _policies)
+    return sorted(_policies)
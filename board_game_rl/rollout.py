@@ -0,0 +1,137 @@
+import numpy as np
+from .board_classes import GameBoard, Player
+
+BATCH_HOOKS = ("batch_winner", "batch_legal_mask", "batch_play")
+
+def sample_actions(masks, rng) -> np.ndarray:
+    """
+    Sample one legal action uniformly at random from each row of a stack of legal-action masks.
+
+    Args:
+    masks: np.ndarray of shape (N, num_actions) and dtype bool
+    rng: np.random.Generator
+
+    Returns:
+    np.ndarray of shape (N,)
+    """
+    return np.argmax(np.where(masks, rng.random(masks.shape), -1.0), axis=1)
+
+def play_random_games(logic, boards, players, rng) -> np.ndarray:
+    """
+    Play every board of a batch to the end with uniformly random legal moves, all boards at once.
+    The boards are used as scratch space and are left in an unspecified state.
+
+    Args:
+    logic: dict[str, callable], must provide "batch_winner", "batch_legal_mask" and "batch_play"
+    boards: np.ndarray of shape (N, rows, cols)
+    players: np.ndarray of shape (N,), the value of the player to move on each board
+    rng: np.random.Generator
+
+    Returns:
+    np.ndarray of shape (N,): The value of the winner of each game (Player.none.value for a draw).
+    """
+    missing = [hook for hook in BATCH_HOOKS if hook not in logic]
+    if missing:
+        raise ValueError(f"Batched rollouts need the logic hooks {missing}.")
+
+    winners = np.full(len(boards), Player.none.value)
+    live_index = np.arange(len(boards))
+    live_boards = boards
+    live_players = np.array(players, dtype=float)
+    while len(live_index):
+        # Record the finished games and drop them from the batch.
+        live_winners = logic["batch_winner"](live_boards)
+        masks = logic["batch_legal_mask"](live_boards)
+        finished = (live_winners != Player.none.value) | ~masks.any(axis=1)
+        if finished.any():
+            winners[live_index[finished]] = live_winners[finished]
+            playing = ~finished
+            if not playing.any():
+                break
+            live_index, live_boards = live_index[playing], live_boards[playing]
+            live_players, masks = live_players[playing], masks[playing]
+
+        # Every unfinished game plays one random legal move.
+        logic["batch_play"](live_boards, live_players, sample_actions(masks, rng))
+        live_players = -live_players
+    return winners
+
+class RolloutEvaluator:
+    """
+    A Monte Carlo value function: the value of a position is estimated by playing num_rollouts random
+    games from it. All rollouts of a position (or of a batch of positions) are played together as one
+    (K, rows, cols) batch through the batched logic hooks "batch_winner", "batch_legal_mask" and
+    "batch_play".
+
+    Args:
+    logic: dict[str, callable]
+    num_rollouts: int
+    seed: int or None
+
+    Methods:
+    outcomes(self, board, player) -> tuple[float, float, float]
+    __call__(self, board, player) -> float
+    evaluate_batch(self, boards, players) -> np.ndarray
+
+    Example:
+    ```python
+    >>> from board_game_rl import GameBoard, Player, tictactoe_logic
+    >>> from board_game_rl.rollout import RolloutEvaluator
+    >>> board = GameBoard(tictactoe_logic)
+    >>> board.reset()
+    >>> evaluator = RolloutEvaluator(tictactoe_logic, num_rollouts=1000, seed=0)
+    >>> evaluator.outcomes(board, Player.A)
+    (0.585, 0.127, 0.288)
+    ```
+    """
+    def __init__(self, logic, num_rollouts=256, seed=None):
+        self.logic = logic
+        self.num_rollouts = num_rollouts
+        self.rng = np.random.default_rng(seed)
+
+    def _rollout(self, boards, players) -> np.ndarray:
+        # Repeat each position num_rollouts times and play all the copies at once.
+        batch = np.repeat(np.asarray(boards, dtype=float), self.num_rollouts, axis=0)
+        batch_players = np.repeat(np.asarray(players, dtype=float), self.num_rollouts)
+        winners = play_random_games(self.logic, batch, batch_players, self.rng)
+        return winners.reshape(-1, self.num_rollouts)
+
+    def outcomes(self, board, player: Player) -> tuple[float, float, float]:
+        """
+        The fractions of random games won, drawn and lost by the player to move.
+
+        Args:
+        board: GameBoard or np.ndarray
+        player: Player, the player to move
+
+        Returns:
+        tuple[float, float, float]
+        """
+        if isinstance(board, GameBoard):
+            board = board.board
+        winners = self._rollout(np.asarray(board)[np.newaxis], [player.value])[0]
+        wins = float(np.count_nonzero(winners == player.value)) / self.num_rollouts
+        draws = float(np.count_nonzero(winners == Player.none.value)) / self.num_rollouts
+        return wins, draws, 1.0 - wins - draws
+
+    def __call__(self, board, player: Player) -> float:
+        """
+        The expected outcome (wins minus losses, in [-1, 1]) of random play for the player to move.
+        """
+        wins, _, losses = self.outcomes(board, player)
+        return wins - losses
+
+    def evaluate_batch(self, boards, players) -> np.ndarray:
+        """
+        The expected outcome of random play for the player to move in each of a batch of positions.
+
+        Args:
+        boards: np.ndarray of shape (B, rows, cols)
+        players: np.ndarray of shape (B,), the value of the player to move in each position
+
+        Returns:
+        np.ndarray of shape (B,)
+        """
+        players = np.asarray(players, dtype=float)
+        winners = self._rollout(boards, players)
+        return (winners * players[:, np.newaxis]).mean(axis=1)
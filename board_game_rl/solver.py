@@ -0,0 +1,235 @@
+import numpy as np
+from .board_classes import GameBoard, Player
+from .symmetry import canonical_code, logic_symmetries
+
+# Transposition table flags: the stored value is exact, a lower bound or an upper bound.
+EXACT, LOWER, UPPER = 0, 1, 2
+
+def opponent(player: Player) -> Player:
+    """
+    The player who moves after player.
+    """
+    return Player.B if player.value == Player.A.value else Player.A
+
+class Solver:
+    """
+    A perfect-play solver for two-player games defined through a logic dictionary. The solver runs
+    negamax with alpha-beta pruning on a single GameBoard using push/pop, and stores the results in a
+    transposition table keyed by the canonical code of the position (see symmetry.canonical_code) and
+    the player to move, so positions related by a symmetry of the game (see
+    symmetry.logic_symmetries) are solved only once.
+
+    Values are from the point of view of the player to move: 0 for a draw, and for a decided game
+    +/-(1 + the number of empty cells left on the final board), so faster wins score higher.
+
+    Args:
+    logic: dict[str, callable]
+
+    Methods:
+    solve(self, board, player) -> int
+    move_values(self, board, player) -> dict
+    best_move(self, board, player) -> tuple
+    solve_all(self, player=Player.A) -> int
+    save(self, path) -> None
+    load(cls, logic, path) -> Solver
+
+    Example:
+    ```python
+    >>> from solver import Solver
+    >>> from tictactoe_logic import tictactoe_logic
+    >>> solver = Solver(tictactoe_logic)
+    >>> solver.solve_all()
+    0
+    >>> solver.save("tictactoe_solved.npz")
+    >>> solver = Solver.load(tictactoe_logic, "tictactoe_solved.npz")
+    ```
+    """
+    def __init__(self, logic: dict[str, callable]):
+        self.logic = logic
+        self.game_board = GameBoard(logic)
+        self.game_board.reset()
+        self.symmetries = logic_symmetries(logic)[0]
+        self.table = {}
+
+    ########################### Search ###########################
+
+    def _terminal_value(self, player: Player) -> int:
+        winner = self.game_board.winner()
+        if winner == Player.none:
+            return 0
+        # Count the empty cells rather than the valid moves, which for games like Connect Four are
+        # columns and do not measure how early the game ended.
+        value = 1 + int(np.count_nonzero(np.asarray(self.game_board.board) == Player.none.value))
+        return value if winner.value == player.value else -value
+
+    def _negamax(self, player: Player, alpha: float, beta: float) -> int:
+        game_board = self.game_board
+        key = (canonical_code(game_board.board, self.symmetries), player.value)
+        alpha_original = alpha
+
+        entry = self.table.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == EXACT:
+                return value
+            elif flag == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        if game_board.game_over():
+            value = self._terminal_value(player)
+            self.table[key] = (value, EXACT)
+            return value
+
+        value = -np.inf
+        next_player = opponent(player)
+        for move in game_board.valid_moves(player):
+            game_board.push(player, move)
+            value = max(value, -self._negamax(next_player, -beta, -alpha))
+            game_board.pop()
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if value <= alpha_original:
+            flag = UPPER
+        elif value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (value, flag)
+        return value
+
+    def solve(self, board, player: Player) -> int:
+        """
+        The exact value of a position for the player to move.
+
+        Args:
+        board: GameBoard or a board in the format of the logic
+        player: Player, the player to move
+
+        Returns:
+        int
+        """
+        self.game_board.set_board(board)
+        return self._negamax(player, -np.inf, np.inf)
+
+    def move_values(self, board, player: Player) -> dict:
+        """
+        The exact value of every valid move of a position, for the player making the move.
+
+        Args:
+        board: GameBoard or a board in the format of the logic
+        player: Player, the player to move
+
+        Returns:
+        dict[tuple, int]
+        """
+        self.game_board.set_board(board)
+        game_board = self.game_board
+        values = {}
+        for move in list(game_board.valid_moves(player)):
+            game_board.push(player, move)
+            values[move] = -self._negamax(opponent(player), -np.inf, np.inf)
+            game_board.pop()
+        return values
+
+    def best_move(self, board, player: Player) -> tuple:
+        """
+        A move with the best exact value for the player to move.
+
+        Args:
+        board: GameBoard or a board in the format of the logic
+        player: Player, the player to move
+
+        Returns:
+        tuple
+        """
+        values = self.move_values(board, player)
+        return max(values, key=values.get)
+
+    def solve_all(self, player: Player = Player.A) -> int:
+        """
+        Solve every position reachable from the initial board, without pruning, so the table holds an
+        exact value for each of them.
+
+        Args:
+        player: Player, the player who moves first
+
+        Returns:
+        int: The value of the initial position.
+        """
+        self.game_board.reset()
+        return self._solve_all(player)
+
+    def _solve_all(self, player: Player) -> int:
+        game_board = self.game_board
+        key = (canonical_code(game_board.board, self.symmetries), player.value)
+        entry = self.table.get(key)
+        if entry is not None and entry[1] == EXACT:
+            return entry[0]
+        if game_board.game_over():
+            value = self._terminal_value(player)
+        else:
+            value = -np.inf
+            next_player = opponent(player)
+            for move in game_board.valid_moves(player):
+                game_board.push(player, move)
+                value = max(value, -self._solve_all(next_player))
+                game_board.pop()
+        self.table[key] = (value, EXACT)
+        return value
+
+    ########################### Storage ###########################
+
+    def save(self, path) -> None:
+        """
+        Save the transposition table as a compressed NumPy archive. The codes of boards over 39
+        cells do not fit in int64 and are stored as rows of little-endian bytes.
+
+        Args:
+        path: str
+        """
+        keys = list(self.table)
+        entries = [self.table[key] for key in keys]
+        size = int(np.prod(self.game_board.board_shape))
+        if size <= 39:
+            codes = np.array([code for code, _ in keys], dtype=np.int64)
+        else:
+            num_bytes = ((3**size - 1).bit_length() + 7) // 8
+            codes = np.frombuffer(b"".join(code.to_bytes(num_bytes, "little") for code, _ in keys), dtype=np.uint8)
+            codes = codes.reshape(len(keys), num_bytes)
+        np.savez_compressed(
+            path,
+            codes=codes,
+            players=np.array([player for _, player in keys], dtype=np.int8),
+            values=np.array([value for value, _ in entries], dtype=np.int32),
+            flags=np.array([flag for _, flag in entries], dtype=np.int8),
+        )
+
+    @classmethod
+    def load(cls, logic: dict[str, callable], path):
+        """
+        Build a solver for logic whose transposition table is read from a file written by save.
+
+        Args:
+        logic: dict[str, callable]
+        path: str
+
+        Returns:
+        Solver
+        """
+        solver = cls(logic)
+        with np.load(path) as data:
+            codes = data["codes"]
+            if codes.ndim == 2:
+                codes = [int.from_bytes(row.tobytes(), "little") for row in codes]
+            else:
+                codes = codes.tolist()
+            keys = zip(codes, data["players"].astype(float).tolist())
+            entries = zip(data["values"].tolist(), data["flags"].tolist())
+            solver.table = dict(zip(keys, entries))
+        return solver
@@ -0,0 +1,175 @@
+import functools
+import numpy as np
+
+# Each cell is stored as the digit (cell value mod 3): empty 0, Player.A 1, Player.B 2.
+# DIGIT_VALUES maps a digit back to the cell value.
+DIGIT_VALUES = np.array([0.0, 1.0, -1.0])
+
+# The seed of the Zobrist tables, fixed so hashes are the same in every process.
+ZOBRIST_SEED = 20240601
+
+@functools.lru_cache(maxsize=None)
+def base3_weights(size: int) -> np.ndarray:
+    """
+    The powers of 3 used to encode a board of size cells as one base-3 integer.
+    """
+    if size > 39:
+        raise ValueError("Boards with more than 39 cells do not fit in a 64-bit base-3 code.")
+    weights = 3 ** np.arange(size, dtype=np.int64)
+    weights.setflags(write=False)
+    return weights
+
+def cell_digits(boards) -> np.ndarray:
+    """
+    The base-3 digits of the cells of one board or of a batch of boards.
+    """
+    # Cells hold player values (-1, 0 or 1), so the cell value mod 3 is the value plus 3 if it is
+    # negative, which is much cheaper than a floating-point mod.
+    digits = np.asarray(boards).astype(np.int64)
+    return digits + 3*(digits < 0)
+
+########################### Base-3 Codes ###########################
+
+def encode_state(board) -> int:
+    """
+    Encode a board as one base-3 integer (cell k is digit k). Works for boards of any size.
+
+    Args:
+    board: np.ndarray or a board with an ndarray view
+
+    Returns:
+    int
+
+    Example:
+    ```python
+    >>> from state_codec import encode_state, decode_state
+    >>> import numpy as np
+    >>> board = np.zeros((3, 3))
+    >>> board[0, 1], board[2, 2] = 1.0, -1.0
+    >>> encode_state(board)
+    13125
+    >>> decode_state(13125, (3, 3))
+    ```
+    """
+    digits = cell_digits(board).ravel()
+    if digits.size <= 39:
+        return int(digits @ base3_weights(digits.size))
+    code = 0
+    for digit in digits[::-1].tolist():
+        code = 3*code + digit
+    return code
+
+def decode_state(code: int, shape: tuple) -> np.ndarray:
+    """
+    Decode a base-3 integer written by encode_state back to a board.
+
+    Args:
+    code: int
+    shape: tuple[int, int]
+
+    Returns:
+    np.ndarray
+    """
+    size = int(np.prod(shape))
+    if size <= 39:
+        return decode_states(np.array([code], dtype=np.int64), shape)[0]
+    digits = np.empty(size, dtype=np.int64)
+    for cell in range(size):
+        code, digits[cell] = divmod(code, 3)
+    return DIGIT_VALUES[digits].reshape(shape)
+
+def encode_states(boards) -> np.ndarray:
+    """
+    Encode a batch of boards (at most 39 cells each) as base-3 integers.
+
+    Args:
+    boards: np.ndarray of shape (N, rows, cols)
+
+    Returns:
+    np.ndarray of shape (N,) and dtype int64
+    """
+    boards = np.asarray(boards)
+    digits = cell_digits(boards).reshape(len(boards), -1)
+    return digits @ base3_weights(digits.shape[1])
+
+def decode_states(codes, shape: tuple) -> np.ndarray:
+    """
+    Decode a batch of base-3 integers written by encode_states.
+
+    Args:
+    codes: np.ndarray of shape (N,)
+    shape: tuple[int, int]
+
+    Returns:
+    np.ndarray of shape (N, rows, cols)
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    weights = base3_weights(int(np.prod(shape)))
+    digits = codes[:, np.newaxis] // weights % 3
+    return DIGIT_VALUES[digits].reshape((len(codes),) + tuple(shape))
+
+########################### Bit-Packed Codes ###########################
+
+def pack_states(boards) -> np.ndarray:
+    """
+    Pack a batch of boards (at most 32 cells each) into 64-bit integers with 2 bits per cell. Packing
+    and unpacking use only shifts and masks, which is faster than base-3 at the cost of larger codes.
+
+    Args:
+    boards: np.ndarray of shape (N, rows, cols)
+
+    Returns:
+    np.ndarray of shape (N,) and dtype uint64
+    """
+    boards = np.asarray(boards)
+    digits = cell_digits(boards).reshape(len(boards), -1).astype(np.uint64)
+    if digits.shape[1] > 32:
+        raise ValueError("Boards with more than 32 cells do not fit in a 64-bit packed code.")
+    shifts = (2*np.arange(digits.shape[1])).astype(np.uint64)
+    return np.bitwise_or.reduce(digits << shifts, axis=1)
+
+def unpack_states(codes, shape: tuple) -> np.ndarray:
+    """
+    Unpack a batch of 64-bit integers written by pack_states.
+
+    Args:
+    codes: np.ndarray of shape (N,)
+    shape: tuple[int, int]
+
+    Returns:
+    np.ndarray of shape (N, rows, cols)
+    """
+    codes = np.asarray(codes, dtype=np.uint64)
+    shifts = (2*np.arange(int(np.prod(shape)))).astype(np.uint64)
+    digits = (codes[:, np.newaxis] >> shifts) & np.uint64(3)
+    return DIGIT_VALUES[digits.astype(np.intp)].reshape((len(codes),) + tuple(shape))
+
+########################### Zobrist Hashing ###########################
+
+@functools.lru_cache(maxsize=None)
+def zobrist_table(size: int) -> tuple:
+    """
+    The Zobrist keys of a board of size cells: zobrist_table(size)[cell][digit] is a random 64-bit
+    integer. The table is generated from a fixed seed, so it is the same in every process.
+    """
+    keys = np.random.default_rng(ZOBRIST_SEED).bit_generator.random_raw(3*size).reshape(size, 3)
+    keys[:, 0] = 0
+    return tuple(tuple(row) for row in keys.tolist())
+
+def zobrist_hash(board) -> int:
+    """
+    The Zobrist hash of a board: the XOR of the keys of its cells. Empty cells contribute nothing, so
+    a move only needs to XOR in the key of the new stone.
+
+    Args:
+    board: np.ndarray or a board with an ndarray view
+
+    Returns:
+    int
+    """
+    digits = cell_digits(board).ravel().tolist()
+    table = zobrist_table(len(digits))
+    code = 0
+    for cell, digit in enumerate(digits):
+        code ^= table[cell][digit]
+    return code
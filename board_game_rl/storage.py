@@ -0,0 +1,32 @@
+import json
+import os
+
+# The metadata file of a directory of memory-mapped column files.
+META_FILE = "meta.json"
+
+def read_meta(directory) -> dict:
+    """
+    Read the metadata of a directory written by write_meta.
+
+    Args:
+    directory: str
+
+    Returns:
+    dict
+    """
+    with open(os.path.join(directory, META_FILE)) as file:
+        return json.load(file)
+
+def write_meta(directory, meta: dict) -> None:
+    """
+    Write the metadata of a directory as JSON. The file is written to a temporary file first and
+    then renamed, so readers never see a half-written file.
+
+    Args:
+    directory: str
+    meta: dict
+    """
+    path = os.path.join(directory, META_FILE)
+    with open(path + ".tmp", "w") as file:
+        json.dump(meta, file)
+    os.replace(path + ".tmp", path)
@@ -0,0 +1,138 @@
+import functools
+import numpy as np
+from .state_codec import base3_weights, cell_digits, encode_state
+
+@functools.lru_cache(maxsize=None)
+def symmetry_permutations(shape: tuple) -> np.ndarray:
+    """
+    The symmetries of a rectangular board as permutations of its flat cell indices. Row s of the
+    result maps a board to its s-th symmetric image: image.ravel() == board.ravel()[perms[s]].
+    Square boards have the 8 symmetries of the square (rotations and reflections), other boards
+    have 4 (identity, the two reflections and the half turn). Row 0 is always the identity.
+
+    Args:
+    shape: tuple[int, int]
+
+    Returns:
+    np.ndarray of shape (S, rows*cols)
+
+    Example:
+    ```python
+    >>> from symmetry import symmetry_permutations
+    >>> symmetry_permutations((3, 3)).shape
+    (8, 9)
+    ```
+    """
+    cells = np.arange(shape[0]*shape[1]).reshape(shape)
+    images = [cells, np.flipud(cells), np.fliplr(cells), np.rot90(cells, 2)]
+    if shape[0] == shape[1]:
+        images += [np.rot90(cells, 1), np.rot90(cells, 3), cells.T, np.rot90(cells, 2).T]
+    perms = np.array([image.ravel() for image in images])
+    perms.setflags(write=False)
+    return perms
+
+@functools.lru_cache(maxsize=None)
+def inverse_symmetry_permutations(shape: tuple) -> np.ndarray:
+    """
+    The inverses of symmetry_permutations(shape): board.ravel() == image.ravel()[inverse[s]].
+
+    Args:
+    shape: tuple[int, int]
+
+    Returns:
+    np.ndarray of shape (S, rows*cols)
+    """
+    perms = symmetry_permutations(shape)
+    inverse = np.argsort(perms, axis=1)
+    inverse.setflags(write=False)
+    return inverse
+
+def logic_symmetries(logic) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The symmetries of the game described by logic, as permutations of the flat cells of the board
+    and the matching permutations of the actions: row s of both arrays is the same symmetry, and
+    action a in the s-th image is action action_perms[s][a] on the board.
+
+    A logic declares its symmetries with a "symmetries" entry holding (cell_perms, action_perms),
+    e.g. when gravity or a custom action space rules some board symmetries out. Otherwise every
+    symmetry of symmetry_permutations applies when actions are flat cells, and only the identity
+    when the logic has its own action space.
+
+    Args:
+    logic: dict[str, callable]
+
+    Returns:
+    tuple[np.ndarray, np.ndarray]: (cell_perms, action_perms), each with row 0 the identity
+    """
+    if "symmetries" in logic:
+        return logic["symmetries"]
+    shape = np.shape(np.asarray(logic["board"]))
+    perms = symmetry_permutations(shape)
+    if "num_actions" in logic and logic["num_actions"] != perms.shape[1]:
+        return perms[:1], np.arange(logic["num_actions"])[np.newaxis]
+    return perms, perms
+
+def symmetric_codes(board, perms=None) -> np.ndarray:
+    """
+    The base-3 codes of every symmetric image of a board, in the order of perms (by default
+    symmetry_permutations(board.shape)). Each cell contributes the digit value mod 3 (empty 0,
+    Player.A 1, Player.B 2). The board must have at most 39 cells.
+
+    Args:
+    board: np.ndarray
+    perms: np.ndarray of shape (S, rows*cols) or None
+
+    Returns:
+    np.ndarray of shape (S,) and dtype int64
+    """
+    board = np.asarray(board)
+    if perms is None:
+        perms = symmetry_permutations(board.shape)
+    digits = cell_digits(board.ravel())
+    return digits[perms] @ base3_weights(board.size)
+
+def canonical_symmetry(board, perms=None) -> tuple[int, int]:
+    """
+    The canonical code of a board, i.e. the smallest base-3 code over all its symmetric images,
+    together with the index of the symmetry that produces it. Boards related by a symmetry have
+    the same canonical code. Boards of more than 39 cells get a Python int code (see encode_state).
+
+    Args:
+    board: np.ndarray
+    perms: np.ndarray or None, the symmetries to consider (see logic_symmetries), by default
+        symmetry_permutations(board.shape)
+
+    Returns:
+    tuple[int, int]: (code, symmetry index)
+
+    Example:
+    ```python
+    >>> from symmetry import canonical_symmetry
+    >>> import numpy as np
+    >>> a, b = np.zeros((3, 3)), np.zeros((3, 3))
+    >>> a[0, 0], b[2, 2] = 1.0, 1.0
+    >>> canonical_symmetry(a)[0] == canonical_symmetry(b)[0]
+    True
+    ```
+    """
+    board = np.asarray(board)
+    if perms is None:
+        perms = symmetry_permutations(board.shape)
+    if board.size <= 39:
+        codes = symmetric_codes(board, perms)
+        index = int(np.argmin(codes))
+        return int(codes[index]), index
+    # The codes do not fit in int64: compare the images digit by digit instead, from the most
+    # significant (last) cell, which is the primary key of lexsort.
+    images = cell_digits(board.ravel())[perms]
+    index = int(np.lexsort(images.T)[0])
+    return encode_state(images[index]), index
+
+def canonical_code(board, perms=None) -> int:
+    """
+    The canonical code of a board, see canonical_symmetry.
+    """
+    board = np.asarray(board)
+    if board.size <= 39:
+        return int(symmetric_codes(board, perms).min())
+    return canonical_symmetry(board, perms)[0]
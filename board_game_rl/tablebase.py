@@ -0,0 +1,201 @@
+import os
+import numpy as np
+from .batch_logic import batch_legal_mask, batch_play, batch_winner
+from .board_classes import GameBoard, Player
+from .state_codec import decode_states, encode_state, encode_states
+from .storage import read_meta, write_meta
+
+# Outcomes for the player to move.
+WIN, DRAW, LOSS = 1, 0, -1
+
+# Distances are below RANK_TIER, which separates the outcome tiers when moves are ranked.
+RANK_TIER = 1 << 15
+
+# The column files of a tablebase directory.
+TABLEBASE_COLUMNS = {"codes": np.int64, "values": np.int8, "distances": np.int16}
+
+########################### Building ###########################
+
+def _expand(logic, codes, num_stones, board_shape, game_board):
+    # Decode a chunk of one layer and play every legal move of the unfinished positions: the winners
+    # of the positions, and the (position index, child code) pair of every move.
+    boards = decode_states(codes, board_shape)
+    winners = batch_winner(logic, boards)
+    masks = batch_legal_mask(logic, boards, game_board.num_actions, game_board.move_to_action)
+    masks[winners != Player.none.value] = False
+    parents, actions = np.nonzero(masks)
+    if not len(parents):
+        return winners, parents, np.empty(0, dtype=np.int64)
+    player = Player.A.value if num_stones % 2 == 0 else Player.B.value
+    children = batch_play(logic, boards[parents], np.full(len(parents), player), actions, game_board.action_to_move)
+    return winners, parents, encode_states(children)
+
+def build_tablebase(logic, directory, chunk_size=1 << 15):
+    """
+    Solve every position reachable from the initial board of a game by retrograde analysis and
+    write the result to directory as a tablebase.
+
+    Positions are enumerated forward by the number of stones on the board (one layer per stone
+    count, Player.A to move on even layers), each stored as its base-3 code. The layers are then
+    labelled backward, from the fullest boards to the empty one, in bulk NumPy passes over chunks
+    of chunk_size positions: a position is a win for the player to move if some move leads to a
+    loss for the opponent, a loss if every move leads to a win for the opponent, and a draw
+    otherwise. The distance is the number of plies to the end of the game with best play: the
+    fastest win, the slowest loss and the fastest way to secure a draw.
+
+    The logic must describe a placement game, in which every move adds exactly one stone (such as
+    tic-tac-toe or small m,n,k-games), on a board of at most 39 cells, so Connect Four (42 cells)
+    does not fit. The batched hooks "batch_winner", "batch_legal_mask" and "batch_play" are used
+    when the logic provides them.
+
+    Args:
+    logic: dict[str, callable]
+    directory: str
+    chunk_size: int
+
+    Returns:
+    Tablebase
+
+    Example:
+    ```python
+    >>> from board_game_rl import mnk_logic
+    >>> from board_game_rl.tablebase import build_tablebase
+    >>> tablebase = build_tablebase(mnk_logic(4, 4, 4), "tablebase_4x4")
+    >>> len(tablebase)
+    ```
+    """
+    game_board = GameBoard(logic)
+    game_board.reset()
+    board_shape = game_board.board_shape
+
+    # Forward: the sorted unique codes of every layer.
+    layers = [np.array([encode_state(game_board.board)], dtype=np.int64)]
+    while len(layers[-1]):
+        num_stones = len(layers) - 1
+        children = []
+        for start in range(0, len(layers[-1]), chunk_size):
+            *_, child_codes = _expand(logic, layers[-1][start:start + chunk_size], num_stones, board_shape, game_board)
+            children.append(np.unique(child_codes))
+        layers.append(np.unique(np.concatenate(children)) if children else np.empty(0, dtype=np.int64))
+    layers.pop()
+
+    # Backward: label each layer from the labels of the next one.
+    values = [None]*len(layers)
+    distances = [None]*len(layers)
+    for num_stones in reversed(range(len(layers))):
+        codes = layers[num_stones]
+        layer_values = np.empty(len(codes), dtype=np.int8)
+        layer_distances = np.empty(len(codes), dtype=np.int16)
+        for start in range(0, len(codes), chunk_size):
+            chunk = codes[start:start + chunk_size]
+            winners, parents, child_codes = _expand(logic, chunk, num_stones, board_shape, game_board)
+            chunk_values = np.where(winners != Player.none.value, LOSS, DRAW).astype(np.int8)
+            chunk_distances = np.zeros(len(chunk), dtype=np.int16)
+            if len(parents):
+                child_index = np.searchsorted(layers[num_stones + 1], child_codes)
+                # The value and distance of each move for the player making it.
+                move_values = -values[num_stones + 1][child_index]
+                move_distances = distances[num_stones + 1][child_index].astype(np.int64) + 1
+                # Rank moves so the best one is the largest: fast wins, then fast draws, then slow
+                # losses, each tier RANK_TIER apart.
+                ranks = np.where(move_values == WIN, 3*RANK_TIER - move_distances,
+                                 np.where(move_values == DRAW, 2*RANK_TIER - move_distances, move_distances))
+                # The moves are grouped by position, in order, so each group is one reduceat segment.
+                starts = np.flatnonzero(np.r_[True, parents[1:] != parents[:-1]])
+                best = np.maximum.reduceat(ranks, starts)
+                positions = parents[starts]
+                wins, draws = best > 2*RANK_TIER, (best > RANK_TIER) & (best < 2*RANK_TIER)
+                chunk_values[positions] = np.where(wins, WIN, np.where(draws, DRAW, LOSS))
+                chunk_distances[positions] = np.where(wins, 3*RANK_TIER - best, np.where(draws, 2*RANK_TIER - best, best))
+            layer_values[start:start + len(chunk)] = chunk_values
+            layer_distances[start:start + len(chunk)] = chunk_distances
+        values[num_stones] = layer_values
+        distances[num_stones] = layer_distances
+
+    # Stone counts differ between layers, so the codes of different layers never collide.
+    codes = np.concatenate(layers)
+    order = np.argsort(codes, kind="stable")
+    os.makedirs(directory, exist_ok=True)
+    for name, column in (("codes", codes), ("values", np.concatenate(values)), ("distances", np.concatenate(distances))):
+        np.save(os.path.join(directory, name + ".npy"), column[order].astype(TABLEBASE_COLUMNS[name]))
+    write_meta(directory, {"board_shape": list(board_shape), "count": len(codes)})
+    return Tablebase(directory, logic)
+
+########################### Lookup ###########################
+
+class Tablebase:
+    """
+    A tablebase written by build_tablebase. The column files are memory-mapped read-only, so opening
+    a tablebase reads nothing up front, a lookup touches only the pages its binary search visits,
+    and every process that opens the same directory shares one copy through the page cache.
+
+    A Tablebase is also a perfect policy, usable with Agent: it plays the move with the best
+    outcome, winning as fast as possible and losing as slowly as possible.
+
+    Args:
+    directory: str
+    logic: dict[str, callable], needed only to use the tablebase as a policy
+
+    Methods:
+    lookup(self, board) -> tuple[int, int]
+    __call__(self, board, player) -> tuple
+
+    Example:
+    ```python
+    >>> from board_game_rl import Agent, Player, mnk_logic
+    >>> from board_game_rl.tablebase import Tablebase
+    >>> logic = mnk_logic(4, 4, 4)
+    >>> tablebase = Tablebase("tablebase_4x4", logic)
+    >>> tablebase.lookup(np.zeros((4, 4)))
+    (0, 16)
+    >>> agentA = Agent(Player.A, tablebase)
+    ```
+    """
+    def __init__(self, directory, logic=None):
+        self.directory = directory
+        self.logic = logic
+        meta = read_meta(directory)
+        self.board_shape = tuple(meta["board_shape"])
+        self.columns = {
+            name: np.load(os.path.join(directory, name + ".npy"), mmap_mode="r") for name in TABLEBASE_COLUMNS
+        }
+        self.codes = self.columns["codes"]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _index(self, code: int) -> int:
+        index = int(np.searchsorted(self.codes, code))
+        if index == len(self.codes) or self.codes[index] != code:
+            raise KeyError("The position is not in the tablebase.")
+        return index
+
+    def lookup(self, board) -> tuple[int, int]:
+        """
+        The outcome (WIN, DRAW or LOSS for the player to move) and the distance to the end of the game
+        of a position.
+
+        Args:
+        board: np.ndarray, a GameBoard or a board with an ndarray view
+
+        Returns:
+        tuple[int, int]
+        """
+        if isinstance(board, GameBoard):
+            board = board.board
+        index = self._index(encode_state(board))
+        return int(self.columns["values"][index]), int(self.columns["distances"][index])
+
+    def __call__(self, board: GameBoard, player: Player) -> tuple:
+        """
+        The best move for player on the board.
+        """
+        best_move, best_rank = None, None
+        for move in board.valid_moves(player):
+            value, distance = self.lookup(board.play(player, move, mutate=False))
+            # The child is scored for the opponent: prefer their fast losses, then fast draws, then
+            # their slow wins.
+            rank = (-value, distance if value == WIN else -distance)
+            if best_rank is None or rank > best_rank:
+                best_move, best_rank = move, rank
+        return best_move
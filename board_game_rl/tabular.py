@@ -0,0 +1,227 @@
+import numpy as np
+from .board_classes import GameBoard, Player
+from .solver import opponent
+
+def state_key(code: int, player: Player) -> int:
+    """
+    The key of a (position, player to move) pair: the base-3 code of the position times 2, plus 1 if
+    Player.B is to move.
+    """
+    return 2*code + (player.value == Player.B.value)
+
+class StateIndex:
+    """
+    A perfect hash of the reachable states of a small game: the state keys (see state_key) are kept
+    sorted in one NumPy array, and the index of a key is its position in that array, found by binary
+    search. Every reachable state gets a distinct index in range(len(index)).
+
+    Args:
+    keys: np.ndarray of int64 state keys
+    """
+    def __init__(self, keys):
+        self.keys = np.unique(np.asarray(keys, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __call__(self, keys) -> np.ndarray:
+        """
+        The indices of a batch of state keys. Raises KeyError if a key is not a reachable state.
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        indices = np.searchsorted(self.keys, keys)
+        if np.any(indices >= len(self.keys)) or np.any(self.keys[np.minimum(indices, len(self.keys) - 1)] != keys):
+            raise KeyError("Unknown state.")
+        return indices
+
+class TabularTrainer:
+    """
+    Tabular Q-learning and TD(0) for small two-player games defined through a logic dictionary.
+
+    On construction every state reachable from the initial board is enumerated once (with
+    GameBoard push/pop), indexed with a StateIndex, and the game is compiled into dense tables:
+    next_states[s, a] is the index of the state after action a in state s (-1 if illegal), terminal[s]
+    and winners[s] describe finished games. Q-values (S, num_actions) and state values (S,) are NumPy
+    arrays, episodes are generated for many games at once from the tables, and updates are applied
+    to whole batches of recorded transitions with vectorized NumPy operations.
+
+    Values are from the point of view of the player to move, so the target of a move is the reward
+    for the mover if it ends the game and minus the opponent's value otherwise.
+
+    Args:
+    logic: dict[str, callable]
+    first_player: Player
+    seed: int or None
+
+    Methods:
+    index(self, board, player) -> int
+    generate_episodes(self, num_games, epsilon) -> tuple
+    q_learning(self, num_episodes, ...) -> np.ndarray
+    td0(self, num_episodes, ...) -> np.ndarray
+    __call__(self, board, player) -> tuple
+
+    Example:
+    ```python
+    >>> from board_game_rl import Agent, Player, tictactoe_logic
+    >>> from board_game_rl.tabular import TabularTrainer
+    >>> trainer = TabularTrainer(tictactoe_logic, seed=0)
+    >>> len(trainer.state_index)
+    5478
+    >>> trainer.q_learning(num_episodes=50000)
+    >>> agentA = Agent(Player.A, trainer)
+    ```
+    """
+    def __init__(self, logic, first_player=Player.A, seed=None):
+        self.logic = logic
+        self.rng = np.random.default_rng(seed)
+        self.game_board = GameBoard(logic)
+        self.game_board.reset()
+        self.num_actions = self.game_board.num_actions
+        self._compile(first_player)
+        self.Q = np.zeros((len(self.state_index), self.num_actions))
+        self.V = np.where(self.terminal, self.winners*self.players, 0.0)
+
+    ########################### Enumeration ###########################
+
+    def _compile(self, first_player: Player) -> None:
+        keys, players, winners, edges = {}, [], [], []
+        game_board = self.game_board
+
+        def visit(player):
+            key = state_key(game_board.encode(), player)
+            if key in keys:
+                return key
+            keys[key] = len(keys)
+            players.append(player.value)
+            winners.append(game_board.winner().value if game_board.game_over() else np.nan)
+            if not game_board.game_over():
+                for action in np.flatnonzero(game_board.legal_mask(player)).tolist():
+                    game_board.push_action(player, action)
+                    edges.append((key, action, visit(opponent(player))))
+                    game_board.pop()
+            return key
+
+        visit(first_player)
+        self.state_index = StateIndex(list(keys))
+        order = self.state_index(list(keys))
+
+        # Dense tables, in the order of the state index.
+        self.players = np.empty(len(keys))
+        self.players[order] = players
+        self.winners = np.empty(len(keys))
+        self.winners[order] = winners
+        self.terminal = ~np.isnan(self.winners)
+        self.winners[~self.terminal] = Player.none.value
+        self.next_states = np.full((len(keys), self.num_actions), -1, dtype=np.int64)
+        if edges:
+            parents, actions, children = (np.array(column, dtype=np.int64) for column in zip(*edges))
+            self.next_states[self.state_index(parents), actions] = self.state_index(children)
+        self.legal = self.next_states >= 0
+        self.initial_state = int(self.state_index([state_key(game_board.encode(), first_player)])[0])
+
+    def index(self, board, player: Player) -> int:
+        """
+        The index of a position with player to move.
+        """
+        self.game_board.set_board(board)
+        return int(self.state_index([state_key(self.game_board.encode(), player)])[0])
+
+    ########################### Episodes ###########################
+
+    def _greedy_actions(self, states, epsilon) -> np.ndarray:
+        legal = self.legal[states]
+        q = np.where(legal, self.Q[states], -np.inf)
+        greedy = np.argmax(q + 1e-9*self.rng.random(q.shape), axis=1)
+        random_actions = np.argmax(np.where(legal, self.rng.random(legal.shape), -1.0), axis=1)
+        explore = self.rng.random(len(states)) < epsilon
+        return np.where(explore, random_actions, greedy)
+
+    def generate_episodes(self, num_games, epsilon=0.1) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Play num_games epsilon-greedy self-play games at once from the compiled tables.
+
+        Args:
+        num_games: int
+        epsilon: float
+
+        Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The states, actions and next states of every move.
+        """
+        states = np.full(num_games, self.initial_state)
+        recorded_states, recorded_actions, recorded_next = [], [], []
+        while len(states):
+            actions = self._greedy_actions(states, epsilon)
+            next_states = self.next_states[states, actions]
+            recorded_states.append(states)
+            recorded_actions.append(actions)
+            recorded_next.append(next_states)
+            states = next_states[~self.terminal[next_states]]
+        return np.concatenate(recorded_states), np.concatenate(recorded_actions), np.concatenate(recorded_next)
+
+    def _targets(self, states, next_states, values) -> np.ndarray:
+        # The reward for the mover if the move ends the game, minus the opponent's value otherwise.
+        terminal = self.terminal[next_states]
+        rewards = self.winners[next_states]*self.players[states]
+        return np.where(terminal, rewards, -values)
+
+    ########################### Learning ###########################
+
+    def q_learning(self, num_episodes, games_per_batch=256, epsilon=0.2, learning_rate=0.5, gamma=1.0) -> np.ndarray:
+        """
+        Train the Q-values with batched self-play Q-learning.
+
+        Args:
+        num_episodes: int, the number of games to play
+        games_per_batch: int, the number of games recorded before each vectorized update
+        epsilon: float, the exploration rate
+        learning_rate: float
+        gamma: float, the discount factor
+
+        Returns:
+        np.ndarray: The Q-values.
+        """
+        for start in range(0, num_episodes, games_per_batch):
+            states, actions, next_states = self.generate_episodes(min(games_per_batch, num_episodes - start), epsilon)
+            best_next = np.where(self.legal[next_states], self.Q[next_states], -np.inf).max(axis=1)
+            targets = self._targets(states, next_states, gamma*np.where(np.isfinite(best_next), best_next, 0.0))
+            # Average the updates of state-action pairs that appear several times in the batch.
+            flat = states*self.num_actions + actions
+            counts = np.bincount(flat, minlength=self.Q.size)
+            deltas = np.bincount(flat, weights=targets - self.Q[states, actions], minlength=self.Q.size)
+            seen = counts > 0
+            self.Q.reshape(-1)[seen] += learning_rate*deltas[seen]/counts[seen]
+        return self.Q
+
+    def td0(self, num_episodes, games_per_batch=256, epsilon=1.0, learning_rate=0.5, gamma=1.0) -> np.ndarray:
+        """
+        Estimate the state values of the epsilon-greedy (by default uniformly random) self-play policy
+        with batched TD(0).
+
+        Args:
+        num_episodes: int
+        games_per_batch: int
+        epsilon: float
+        learning_rate: float
+        gamma: float
+
+        Returns:
+        np.ndarray: The state values, for the player to move.
+        """
+        for start in range(0, num_episodes, games_per_batch):
+            states, _, next_states = self.generate_episodes(min(games_per_batch, num_episodes - start), epsilon)
+            targets = self._targets(states, next_states, gamma*self.V[next_states])
+            counts = np.bincount(states, minlength=len(self.V))
+            deltas = np.bincount(states, weights=targets - self.V[states], minlength=len(self.V))
+            seen = counts > 0
+            self.V[seen] += learning_rate*deltas[seen]/counts[seen]
+        return self.V
+
+    ########################### Policy ###########################
+
+    def __call__(self, board: GameBoard, player: Player) -> tuple:
+        """
+        The greedy policy of the learned Q-values, usable with Agent.
+        """
+        state = self.index(board, player)
+        action = int(np.argmax(np.where(self.legal[state], self.Q[state], -np.inf)))
+        return self.game_board.action_to_move(action)
@@ -0,0 +1,152 @@
+import concurrent.futures
+import random
+import numpy as np
+from .board_classes import GameBoard, Player
+from .board_playing import play_game
+from .registry import get_game
+
+class TournamentResult:
+    """
+    The aggregated result of a tournament between agent A (moving first) and agent B.
+
+    Args:
+    winners: np.ndarray, the value of the winner of each game (Player.none.value for a draw)
+    game_lengths: np.ndarray, the number of moves of each game
+
+    Attributes:
+    wins: int, the games won by agent A
+    draws: int, the drawn games
+    losses: int, the games won by agent B
+    """
+    def __init__(self, winners: np.ndarray, game_lengths: np.ndarray):
+        self.winners = winners
+        self.game_lengths = game_lengths
+        self.wins = int(np.count_nonzero(winners == Player.A.value))
+        self.losses = int(np.count_nonzero(winners == Player.B.value))
+        self.draws = len(winners) - self.wins - self.losses
+
+    @property
+    def num_games(self) -> int:
+        return len(self.winners)
+
+    @property
+    def mean_game_length(self) -> float:
+        return float(self.game_lengths.mean()) if len(self.game_lengths) else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"TournamentResult(games={self.num_games}, wins={self.wins}, draws={self.draws}, "
+            f"losses={self.losses}, mean_game_length={self.mean_game_length:.2f})"
+        )
+
+def seed_worker(seed_sequence: np.random.SeedSequence) -> None:
+    """
+    Seed the global `random` and NumPy generators of the current process from a seed sequence, so
+    policies that draw from either are reproducible.
+    """
+    random.seed(int(seed_sequence.generate_state(1, dtype=np.uint64)[0]))
+    np.random.seed(seed_sequence.generate_state(4))
+
+def global_random_state() -> tuple:
+    """
+    The states of the global `random` and NumPy generators, for set_global_random_state.
+    """
+    return random.getstate(), np.random.get_state()
+
+def set_global_random_state(state: tuple) -> None:
+    """
+    Restore the global `random` and NumPy generators to a state from global_random_state.
+    """
+    random.setstate(state[0])
+    np.random.set_state(state[1])
+
+def play_games(logic, agent_factory_a, agent_factory_b, num_games, seed_sequence=None) -> tuple:
+    """
+    Play num_games games between two agents in the current process, without printing.
+
+    Args:
+    logic: dict[str, callable] or str, the logic or the name of a registered game
+    agent_factory_a: callable, called as agent_factory_a(Player.A) and returning an Agent
+    agent_factory_b: callable, called as agent_factory_b(Player.B) and returning an Agent
+    num_games: int
+    seed_sequence: np.random.SeedSequence or None
+
+    Returns:
+    tuple[np.ndarray, np.ndarray]: The winner values and the game lengths.
+    """
+    if seed_sequence is not None:
+        seed_worker(seed_sequence)
+    if isinstance(logic, str):
+        logic = get_game(logic)
+    board = GameBoard(logic)
+    agentA = agent_factory_a(Player.A)
+    agentB = agent_factory_b(Player.B)
+    winners = np.empty(num_games)
+    game_lengths = np.empty(num_games, dtype=np.int32)
+    for game in range(num_games):
+        winner, num_moves = play_game(board, agentA, agentB)
+        winners[game] = winner.value
+        game_lengths[game] = num_moves
+    return winners, game_lengths
+
+def run_tournament(logic, agent_factory_a, agent_factory_b, num_games, num_workers=None, seed=None, chunk_size=256) -> TournamentResult:
+    """
+    Play num_games games between two agents over a pool of worker processes and aggregate the results.
+    Agent A always moves first.
+
+    The games are split into chunks of chunk_size games, and each chunk gets its own child of
+    np.random.SeedSequence(seed). The results therefore depend only on seed and chunk_size, not on
+    the number of workers or on scheduling. The logic and the agent factories are sent to the
+    workers, so they must be picklable (e.g. module-level functions). Passing the name of a
+    registered game instead of its logic lets each worker import only that game. When the games
+    are played in-process, the global random generators of the caller are restored afterwards.
+
+    Args:
+    logic: dict[str, callable] or str
+    agent_factory_a: callable, called as agent_factory_a(Player.A) and returning an Agent
+    agent_factory_b: callable, called as agent_factory_b(Player.B) and returning an Agent
+    num_games: int
+    num_workers: int or None, the number of processes (None uses every CPU, 1 plays in-process)
+    seed: int or None
+    chunk_size: int
+
+    Returns:
+    TournamentResult
+
+    Example:
+    ```python
+    >>> from board_game_rl import Agent, random_policy, tictactoe_logic
+    >>> from board_game_rl.tournament import run_tournament
+    >>> def random_agent(player):
+    ...     return Agent(player, random_policy)
+    >>> run_tournament(tictactoe_logic, random_agent, random_agent, 10000, seed=0)
+    ```
+    """
+    num_chunks = -(-num_games // chunk_size)
+    sizes = [min(chunk_size, num_games - chunk*chunk_size) for chunk in range(num_chunks)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(num_chunks)
+
+    if num_workers == 1 or num_chunks <= 1:
+        # play_games seeds the global generators, which belong to the caller in this process.
+        caller_state = global_random_state()
+        try:
+            results = [
+                play_games(logic, agent_factory_a, agent_factory_b, size, seed_sequence)
+                for size, seed_sequence in zip(sizes, seed_sequences)
+            ]
+        finally:
+            set_global_random_state(caller_state)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+            results = list(executor.map(
+                play_games,
+                [logic]*num_chunks,
+                [agent_factory_a]*num_chunks,
+                [agent_factory_b]*num_chunks,
+                sizes,
+                seed_sequences,
+            ))
+
+    winners = np.concatenate([winners for winners, _ in results]) if results else np.empty(0)
+    game_lengths = np.concatenate([lengths for _, lengths in results]) if results else np.empty(0, dtype=np.int32)
+    return TournamentResult(winners, game_lengths)
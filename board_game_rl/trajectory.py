@@ -0,0 +1,180 @@
+import os
+import numpy as np
+from .storage import META_FILE, read_meta, write_meta
+
+def trajectory_columns(board_shape: tuple) -> dict:
+    """
+    The columns of a trajectory store: name -> (dtype, shape of one row). Board cells are stored as
+    int8 player values (1 for Player.A, -1 for Player.B, 0 for empty), actions as flat cell indices.
+    """
+    board_shape = tuple(board_shape)
+    return {
+        "states" : (np.int8, board_shape),
+        "next_states" : (np.int8, board_shape),
+        "actions" : (np.int32, ()),
+        "players" : (np.int8, ()),
+        "rewards" : (np.float32, ()),
+        "dones" : (np.bool_, ()),
+    }
+
+class TrajectoryRecorder:
+    """
+    A recorder of (state, action, player, reward, done, next state) transitions. Transitions are
+    collected in small preallocated columnar arrays and flushed to one memory-mapped .npy file per
+    column in directory. The files have a fixed capacity and are used as a ring: once full, the
+    oldest transitions are overwritten.
+
+    Pass a recorder to GameEnv(game_logic, recorder=recorder) and every call to step is recorded.
+
+    Args:
+    directory: str
+    capacity: int, the number of transitions kept on disk
+    board_shape: tuple[int, int]
+    buffer_size: int, the number of transitions collected in memory between flushes
+
+    Example:
+    ```python
+    >>> from board_game_rl import GameEnv, tictactoe_logic
+    >>> from board_game_rl.trajectory import TrajectoryRecorder, ReplayBuffer
+    >>> with TrajectoryRecorder("replay", capacity=10_000_000, board_shape=(3, 3)) as recorder:
+    ...     env = GameEnv(tictactoe_logic, recorder=recorder)
+    ...     # play games with env.step(...)
+    >>> batch = ReplayBuffer("replay").sample(256)
+    ```
+    """
+    def __init__(self, directory, capacity, board_shape, buffer_size=4096):
+        self.directory = directory
+        self.capacity = capacity
+        self.board_shape = tuple(board_shape)
+        self.columns = trajectory_columns(self.board_shape)
+        os.makedirs(directory, exist_ok=True)
+
+        # Reopen an existing store and keep appending to it, or create a new one.
+        if os.path.exists(os.path.join(directory, META_FILE)):
+            meta = read_meta(directory)
+            if meta["capacity"] != capacity or tuple(meta["board_shape"]) != self.board_shape:
+                raise ValueError("The existing trajectory store has a different capacity or board shape.")
+            self.count = meta["count"]
+            mode = "r+"
+        else:
+            self.count = 0
+            mode = "w+"
+        self.files = {
+            name: np.lib.format.open_memmap(
+                os.path.join(directory, name + ".npy"), mode=mode, dtype=dtype, shape=(capacity,) + shape
+            )
+            for name, (dtype, shape) in self.columns.items()
+        }
+        self.buffers = {
+            name: np.zeros((buffer_size,) + shape, dtype=dtype) for name, (dtype, shape) in self.columns.items()
+        }
+        self.buffered = 0
+        write_meta(directory, self._meta())
+
+    def _meta(self) -> dict:
+        return {"capacity": self.capacity, "count": self.count, "board_shape": list(self.board_shape)}
+
+    def record(self, state, action, player, reward, done, next_state) -> None:
+        """
+        Record one transition.
+
+        Args:
+        state: np.ndarray, the board before the move
+        action: int, the flat index of the move
+        player: Player, the player who moved
+        reward: float
+        done: bool
+        next_state: np.ndarray, the board after the move
+        """
+        buffers, row = self.buffers, self.buffered
+        buffers["states"][row] = state
+        buffers["next_states"][row] = next_state
+        buffers["actions"][row] = action
+        buffers["players"][row] = player.value
+        buffers["rewards"][row] = reward
+        buffers["dones"][row] = done
+        self.buffered += 1
+        if self.buffered == len(buffers["actions"]):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered transitions to the memory-mapped files and update the metadata.
+        """
+        if self.buffered:
+            rows = (self.count + np.arange(self.buffered)) % self.capacity
+            for name, file in self.files.items():
+                file[rows] = self.buffers[name][:self.buffered]
+                file.flush()
+            self.count += self.buffered
+            self.buffered = 0
+        write_meta(self.directory, self._meta())
+
+    def close(self) -> None:
+        self.flush()
+        self.files = {}
+
+    def __len__(self) -> int:
+        return min(self.count + self.buffered, self.capacity)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ReplayBuffer:
+    """
+    A fixed-capacity replay sampler over a trajectory store written by TrajectoryRecorder. The column
+    files are memory-mapped read-only, so only the rows of each sampled minibatch are read from disk
+    and the store can be much larger than RAM.
+
+    Args:
+    directory: str
+    seed: int or None
+
+    Example:
+    ```python
+    >>> from board_game_rl.trajectory import ReplayBuffer
+    >>> replay = ReplayBuffer("replay", seed=0)
+    >>> batch = replay.sample(256)
+    >>> batch["states"].shape
+    (256, 3, 3)
+    ```
+    """
+    def __init__(self, directory, seed=None):
+        self.directory = directory
+        self.rng = np.random.default_rng(seed)
+        meta = read_meta(directory)
+        self.capacity = meta["capacity"]
+        self.board_shape = tuple(meta["board_shape"])
+        self.files = {
+            name: np.load(os.path.join(directory, name + ".npy"), mmap_mode="r")
+            for name in trajectory_columns(self.board_shape)
+        }
+        self.count = meta["count"]
+
+    def refresh(self) -> None:
+        """
+        Pick up transitions flushed by a recorder since this buffer was opened.
+        """
+        self.count = read_meta(self.directory)["count"]
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def sample(self, batch_size) -> dict:
+        """
+        Sample a minibatch of transitions uniformly from the store.
+
+        Args:
+        batch_size: int
+
+        Returns:
+        dict[str, np.ndarray]: One array per column.
+        """
+        if len(self) == 0:
+            raise ValueError("The replay buffer is empty.")
+        # Sorted rows keep the reads from the mapped files sequential.
+        rows = np.sort(self.rng.integers(0, len(self), size=batch_size))
+        return {name: file[rows] for name, file in self.files.items()}
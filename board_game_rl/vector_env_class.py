@@ -0,0 +1,130 @@
+import numpy as np
+from .batch_logic import batch_legal_mask, batch_play, batch_winner
+from .board_classes import Player
+
+class VectorGameEnv:
+    """
+    A vectorized board game environment. The environment keeps N boards of the same game in one
+    (N, rows, cols) array and plays one move on every board per call to step. Games that finish are
+    reset automatically, so every board always holds a game in progress.
+
+    Actions are flat cell indices (action = row * cols + col), unless the logic defines its own
+    action space with "num_actions", "move_to_action" and "action_to_move". The player to move on
+    each board is tracked by the environment; every game starts with Player.A and the players
+    alternate.
+
+    If the game logic provides the batched hooks "batch_winner", "batch_legal_mask" and "batch_play",
+    winners, draws and legal-move masks are computed for the whole batch in a single NumPy call.
+    Otherwise the environment falls back to calling "winner", "valid_moves" and "play" once per board
+    (see batch_logic), converting each board with "from_array" when the logic has it.
+
+    Args:
+    game_logic: dict[str, callable]
+    num_envs: int
+
+    Example:
+    ```python
+    >>> import numpy as np
+    >>> from board_game_rl import VectorGameEnv, tictactoe_logic
+    >>> env = VectorGameEnv(tictactoe_logic, num_envs=1024)
+    >>> boards, dones = env.reset()
+    >>> masks = env.legal_masks()
+    >>> actions = np.array([np.random.choice(np.flatnonzero(mask)) for mask in masks])
+    >>> boards, rewards, dones, winners = env.step(actions)
+    ```
+    """
+    def __init__(self, game_logic, num_envs):
+        self.logic = game_logic
+        self.num_envs = num_envs
+        self.initial_board = np.asarray(game_logic["board"], dtype=float)
+        self.board_shape = self.initial_board.shape
+        self.num_actions = game_logic.get("num_actions", self.initial_board.size)
+        self.boards = np.repeat(self.initial_board[np.newaxis], num_envs, axis=0)
+        self.final_boards = self.boards.copy()
+        self.players = np.full(num_envs, Player.A.value)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self.winners = np.full(num_envs, Player.none.value)
+        self._env_index = np.arange(num_envs)
+        self._masks = self._batch_legal_mask(self.boards)
+
+    def reset(self):
+        """
+        Reset every board to the initial state.
+
+        Returns:
+        tuple: The (N, rows, cols) array of boards and the (N,) array of done flags.
+        """
+        self.boards[:] = self.initial_board
+        self.players[:] = Player.A.value
+        self.dones[:] = False
+        self.winners[:] = Player.none.value
+        self._masks = self._batch_legal_mask(self.boards)
+        return self.boards, self.dones
+
+    def legal_masks(self) -> np.ndarray:
+        """
+        Return the legal-move masks of all boards.
+
+        Returns:
+        np.ndarray: A boolean array of shape (N, num_actions).
+        """
+        return self._masks
+
+    def step(self, actions):
+        """
+        Play one move on every board. The move on board i is made by self.players[i].
+
+        Args:
+        actions (np.ndarray): The (N,) array of actions to play.
+
+        Returns:
+        tuple: The boards, the rewards of the players who moved, the done flags and the winner values.
+        The boards of games that finished in this step have already been reset; their final positions
+        are available in self.final_boards.
+        """
+        actions = np.asarray(actions, dtype=np.intp)
+        if not self._masks[self._env_index, actions].all():
+            raise ValueError("Illegal move in batch. Check the actions against legal_masks().")
+
+        movers = self.players.copy()
+        self._batch_play(self.boards, movers, actions)
+
+        # Detect wins and draws for the whole batch.
+        self.winners = self._batch_winner(self.boards)
+        masks = self._batch_legal_mask(self.boards)
+        self.dones = (self.winners != Player.none.value) | ~masks.any(axis=1)
+
+        # Reward the player who just moved: +1 for a win, -1 for a loss and 0 otherwise.
+        rewards = self.winners * movers
+
+        # Switch players and reset the finished games.
+        self.players = -movers
+        if self.dones.any():
+            self.final_boards[self.dones] = self.boards[self.dones]
+            self.boards[self.dones] = self.initial_board
+            self.players[self.dones] = Player.A.value
+            masks[self.dones] = self._batch_legal_mask(self.boards[self.dones])
+        self._masks = masks
+
+        return self.boards, rewards, self.dones, self.winners
+
+    ########################### Batched Logic ###########################
+
+    def _batch_winner(self, boards) -> np.ndarray:
+        return batch_winner(self.logic, boards)
+
+    def _batch_legal_mask(self, boards) -> np.ndarray:
+        return batch_legal_mask(self.logic, boards, self.num_actions, self._move_to_action)
+
+    def _batch_play(self, boards, players, actions) -> np.ndarray:
+        return batch_play(self.logic, boards, players, actions, self._action_to_move)
+
+    def _move_to_action(self, move) -> int:
+        if "move_to_action" in self.logic:
+            return self.logic["move_to_action"](move)
+        return int(np.ravel_multi_index(move, self.board_shape))
+
+    def _action_to_move(self, action) -> tuple:
+        if "action_to_move" in self.logic:
+            return self.logic["action_to_move"](action)
+        return tuple(int(index) for index in np.unravel_index(action, self.board_shape))
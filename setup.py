@@ -10,6 +10,11 @@ setup(
         'numpy',
         'tabulate',
     ],
+    entry_points={
+        'console_scripts': [
+            'board-game-rl-benchmark=board_game_rl.benchmark:main',
+        ],
+    },
     description='A reinforcement learning package for board games',
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',